@@ -4,20 +4,35 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import struct
 import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import imageio.v2 as imageio
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from PIL import Image
 
 
+# Precompiled little-endian readers for the hot parse paths.
+_UP_U16 = struct.Struct("<H").unpack_from
+_UP_U32 = struct.Struct("<I").unpack_from
+_UP_F32 = struct.Struct("<f").unpack_from
+_UP_3F = struct.Struct("<3f").unpack_from
+_UP_II = struct.Struct("<II").unpack_from
+
+
 class Reader:
     def __init__(self, data: bytes, base: int = 0):
         self.data = data
+        self._mv = memoryview(data)
         self.ofs = base
 
     def tell(self) -> int:
@@ -32,70 +47,73 @@ class Reader:
         self.seek(self.ofs + n)
 
     def u8(self) -> int:
-        v = self.data[self.ofs]
+        v = self._mv[self.ofs]
         self.ofs += 1
         return v
 
     def u16(self) -> int:
-        v = struct.unpack_from("<H", self.data, self.ofs)[0]
+        v = _UP_U16(self.data, self.ofs)[0]
         self.ofs += 2
         return v
 
     def u32(self) -> int:
-        v = struct.unpack_from("<I", self.data, self.ofs)[0]
+        v = _UP_U32(self.data, self.ofs)[0]
         self.ofs += 4
         return v
 
     def f32(self) -> float:
-        v = struct.unpack_from("<f", self.data, self.ofs)[0]
+        v = _UP_F32(self.data, self.ofs)[0]
         self.ofs += 4
         return v
 
-    def bytes(self, n: int) -> bytes:
-        b = self.data[self.ofs : self.ofs + n]
+    def view(self, n: int) -> memoryview:
+        # Zero-copy variant of bytes() for callers that only read from the result.
+        b = self._mv[self.ofs : self.ofs + n]
         if len(b) != n:
             raise ValueError("unexpected EOF")
         self.ofs += n
         return b
 
+    def bytes(self, n: int) -> bytes:
+        return bytes(self.view(n))
+
+    def record(self) -> memoryview:
+        # u32 size-prefixed record, size dword included, as a zero-copy view.
+        start = self.ofs
+        size = self.u32()
+        if size < 4:
+            raise ValueError(f"bad record size {size} at {start:#x}")
+        self.ofs = start
+        return self.view(size)
+
     def cstr(self) -> str:
         end = self.data.find(b"\x00", self.ofs)
         if end < 0:
             raise ValueError("unterminated cstr")
-        s = self.data[self.ofs : end].decode("utf-8", "replace")
+        s = str(self._mv[self.ofs : end], "utf-8", "replace")
         self.ofs = end + 1
         return s
 
 
-def half_to_float(h: int) -> float:
-    # IEEE 754 half -> float32
-    s = (h >> 15) & 1
-    e = (h >> 10) & 0x1F
-    f = h & 0x3FF
-    if e == 0:
-        if f == 0:
-            return -0.0 if s else 0.0
-        # subnormal
-        return (-1.0 if s else 1.0) * (f / 1024.0) * (2.0 ** (-14))
-    if e == 31:
-        if f == 0:
-            return float("-inf") if s else float("inf")
-        return float("nan")
-    return (-1.0 if s else 1.0) * (1.0 + f / 1024.0) * (2.0 ** (e - 15))
+# decl & 0x400E -> size of the leading position block (sub_10090BDA).
+_DECL_BASE_STRIDE = {
+    0x0002: 12,
+    0x0004: 16,
+    0x0006: 16,
+    0x0008: 20,
+    0x000A: 24,
+    0x000C: 28,
+    0x000E: 32,
+}
+_DECL_BASE_STRIDE_LUT = np.zeros(0x400F, dtype=np.int64)
+_DECL_BASE_STRIDE_LUT[list(_DECL_BASE_STRIDE)] = list(_DECL_BASE_STRIDE.values())
 
 
+@lru_cache(maxsize=None)
 def vertex_stride_from_decl(decl: int) -> int:
     # mirror of sub_10090BDA
     base_sel = decl & 0x400E
-    base = {
-        0x0002: 12,
-        0x0004: 16,
-        0x0006: 16,
-        0x0008: 20,
-        0x000A: 24,
-        0x000C: 28,
-        0x000E: 32,
-    }.get(base_sel, 0)
+    base = _DECL_BASE_STRIDE.get(base_sel, 0)
 
     stride = base
     if decl & 0x10:
@@ -126,7 +144,40 @@ def vertex_stride_from_decl(decl: int) -> int:
     return stride
 
 
-def scan_scn0_stride32_mesh_blocks(payload: bytes, *, start: int) -> List[Dict[str, int]]:
+def vertex_strides_from_decls(decls: np.ndarray) -> np.ndarray:
+    """
+    Vectorized vertex_stride_from_decl over an array of decl dwords.
+    """
+
+    d = decls.astype(np.int64)
+    stride = _DECL_BASE_STRIDE_LUT[d & 0x400E]
+    stride += 12 * ((d >> 4) & 1) + 4 * ((d >> 5) & 1) + 4 * ((d >> 6) & 1) + 4 * ((d >> 7) & 1)
+
+    uv_count = (d >> 8) & 0xF
+    uv_fmt_bits = (d >> 16) & 0xFFFF
+    packed = uv_fmt_bits != 0
+    stride += np.where(packed, 0, 8 * uv_count)
+    # 2 bits per UV set; past the 8th set the format bits are exhausted and read as fmt 0.
+    fmt_size = np.array([8, 12, 16, 4], dtype=np.int64)
+    for i in range(15):
+        stride += np.where(packed & (uv_count > i), fmt_size[(uv_fmt_bits >> (2 * i)) & 3], 0)
+    return stride
+
+
+_SCN0_TAG_101 = struct.pack("<I", 101)
+_SCN0_TAG_102 = struct.pack("<I", 102)
+
+
+# One row per SCN0 stride32 block found by scan_scn0_stride32_mesh_blocks (byte offsets/sizes).
+_SCN0_BLOCK = np.dtype(
+    [
+        (name, "<i8")
+        for name in ("off", "vcount", "vb_off", "vb_size", "tag", "ib_bytes", "ib_off", "end_off", "stride")
+    ]
+)
+
+
+def scan_scn0_stride32_mesh_blocks(payload: bytes, *, start: int) -> np.ndarray:
     """
     SCN0 has an additional packed layout used by some files (observed in sc06/ou06A.scn):
 
@@ -137,73 +188,96 @@ def scan_scn0_stride32_mesh_blocks(payload: bytes, *, start: int) -> List[Dict[s
       ib[ib_bytes]
 
     Old debug scripts find these by bruteforce. Here we do a format-based scan starting from
-    the scene-tree end, 4-byte aligned, within a bounded window.
+    the scene-tree end, at every byte offset, within a bounded window.
+
+    Returns a _SCN0_BLOCK structured array, one row per block in file order, so callers can
+    filter/rank blocks column-wise.
     """
 
     STRIDE = 32
-    out: List[Dict[str, int]] = []
+    out: List[Tuple[int, ...]] = []
     n = len(payload)
     # Scan the remainder of the file from tree end. This stays format-based and avoids missing
     # the high LOD when it sits later in the container.
     scan_end = n
-    # Offsets are not guaranteed to be aligned (strings can precede), so scan bytewise within the window.
-    for off in range(max(0, start), max(0, scan_end - 16)):
-        if off + 4 > n:
+    # Offsets are not guaranteed to be aligned (strings can precede), so every byte offset in the
+    # window is a candidate. Header checks run vectorized over a u32 view per alignment class
+    # (off % 4); only the surviving offsets go through the per-candidate checks below.
+    lo = max(0, start)
+    hi = max(0, scan_end - 16)
+    # Coarse filter via bytes.rfind: a block's tag sits at least 4 + 3 * STRIDE bytes past its
+    # header, so nothing can start after the last 101/102 word minus that distance.
+    min_tag_off = lo + 4 + 3 * STRIDE
+    last_tag = max(payload.rfind(_SCN0_TAG_101, min_tag_off), payload.rfind(_SCN0_TAG_102, min_tag_off))
+    if last_tag < 0:
+        return np.zeros(0, dtype=_SCN0_BLOCK)
+    hi = min(hi, last_tag - (4 + 3 * STRIDE) + 1)
+    candidates: List[int] = []
+    for k in range(4):
+        if n - k < 4:
             break
-        vcount = struct.unpack_from("<I", payload, off)[0]
-        if vcount < 3 or vcount > 2_000_000:
+        words = np.frombuffer(payload, dtype="<u4", count=(n - k) // 4, offset=k)
+        j_lo = max(0, (lo - k + 3) // 4)
+        j_hi = max(0, (hi - k + 3) // 4)
+        if j_hi <= j_lo:
+            continue
+        # Tags are rare, so test them first: an alignment class without any 101/102 word
+        # has no blocks at all, and otherwise the tag mask thins out the vcount candidates
+        # before anything else is gathered.
+        is_tag = (words == 101) | (words == 102)
+        if not is_tag.any():
             continue
+        vcounts = words[j_lo:j_hi].astype(np.int64)
+        sel = np.nonzero((vcounts >= 3) & (vcounts <= 2_000_000))[0]
+        # tag sits right after the vertex buffer, in the same alignment class as the header.
+        tag_idx = j_lo + sel + 1 + vcounts[sel] * (STRIDE // 4)
+        in_range = tag_idx + 1 < len(words)
+        sel, tag_idx = sel[in_range], tag_idx[in_range]
+        tagged = is_tag[tag_idx]
+        sel, tag_idx = sel[tagged], tag_idx[tagged]
+        ib_bytes = words[tag_idx + 1].astype(np.int64)
+        idx_count = ib_bytes // 2
+        hit = (
+            (ib_bytes > 0)
+            & (ib_bytes <= 500_000_000)
+            & ((ib_bytes % 2) == 0)
+            & (k + (tag_idx + 2) * 4 + ib_bytes <= n)
+            & (idx_count >= 3)
+            & ((idx_count % 3) == 0)
+        )
+        candidates.extend((k + (j_lo + sel[hit]) * 4).tolist())
+
+    for off in sorted(candidates):
+        vcount = _UP_U32(payload, off)[0]
         vb_off = off + 4
         vb_size = vcount * STRIDE
         tag_off = vb_off + vb_size
-        if tag_off + 8 > n:
-            continue
-        tag = struct.unpack_from("<I", payload, tag_off)[0]
-        if tag not in (101, 102):
-            continue
-        ib_bytes = struct.unpack_from("<I", payload, tag_off + 4)[0]
-        if ib_bytes <= 0 or ib_bytes > 500_000_000 or (ib_bytes % 2) != 0:
-            continue
+        tag = _UP_U32(payload, tag_off)[0]
+        ib_bytes = _UP_U32(payload, tag_off + 4)[0]
         ib_off = tag_off + 8
         ib_end = ib_off + ib_bytes
-        if ib_end > n:
-            continue
         idx_count = ib_bytes // 2
-        if idx_count < 3 or (idx_count % 3) != 0:
-            continue
         # Cheap validity checks:
         # - first vertex position floats should look sane (avoid false positives).
-        x, y, z = struct.unpack_from("<3f", payload, vb_off)
+        x, y, z = _UP_3F(payload, vb_off)
         if not (abs(x) <= 200000.0 and abs(y) <= 200000.0 and abs(z) <= 200000.0):
             continue
         # - indices should not exceed vcount (sample a few).
         sample = min(10, idx_count)
         ok = True
         for i in range(sample):
-            idx = struct.unpack_from("<H", payload, ib_off + i * 2)[0]
+            idx = _UP_U16(payload, ib_off + i * 2)[0]
             if idx >= vcount:
                 ok = False
                 break
         if not ok:
             continue
-        out.append(
-            {
-                "off": off,
-                "vcount": vcount,
-                "vb_off": vb_off,
-                "vb_size": vb_size,
-                "tag": tag,
-                "ib_bytes": ib_bytes,
-                "ib_off": ib_off,
-                "end_off": ib_end,
-                "stride": STRIDE,
-            }
-        )
-    return out
+        out.append((off, vcount, vb_off, vb_size, tag, ib_bytes, ib_off, ib_end, STRIDE))
+    return np.array(out, dtype=_SCN0_BLOCK)
 
 
 def decode_scn0_stride32_mesh_block(
-    payload: bytes, block: Dict[str, int], *, flip_v: bool, swap_yz: bool
+    payload: bytes, block: np.void, *, flip_v: bool, swap_yz: bool, quantize: bool = False
 ) -> Mesh:
     STRIDE = 32
     vcount = int(block["vcount"])
@@ -211,115 +285,92 @@ def decode_scn0_stride32_mesh_block(
     ib_off = int(block["ib_off"])
     ib_bytes = int(block["ib_bytes"])
 
-    vertices: List[Tuple[float, float, float]] = []
-    normals: List[Optional[Tuple[float, float, float]]] = []
-    uvs: List[Optional[Tuple[float, float]]] = []
-
-    for i in range(vcount):
-        base = vb_off + i * STRIDE
-        x, y, z = struct.unpack_from("<3f", payload, base)
-        nx, ny, nz = struct.unpack_from("<3f", payload, base + 12)
-        u, v = struct.unpack_from("<2f", payload, base + 24)
-        if swap_yz:
-            y, z = z, y
-            ny, nz = nz, ny
-        if flip_v:
-            v = 1.0 - v
-        vertices.append((x, y, z))
-        normals.append((nx, ny, nz))
-        uvs.append((u, v))
-
+    # Decode the whole vertex buffer at once: one (vcount, 8) float32 view. The Y/Z swap is a
+    # column reorder folded into the copy out of the payload, and the V flip is done in place.
+    arr = np.frombuffer(payload, dtype="<f4", count=vcount * (STRIDE // 4), offset=vb_off)
+    arr = arr.reshape(vcount, STRIDE // 4)
+    arr = arr[:, [0, 2, 1, 3, 5, 4, 6, 7]] if swap_yz else arr.copy()
+    if flip_v:
+        np.subtract(1.0, arr[:, 7], out=arr[:, 7])
+    pos = arr[:, 0:3]
+    nrm = arr[:, 3:6]
+    uv = arr[:, 6:8]
+
+    # The scanner only accepts ib_bytes that hold whole u16 triangles.
     idx_count = ib_bytes // 2
-    indices = list(struct.unpack_from("<" + "H" * idx_count, payload, ib_off))
-    faces: List[Tuple[int, int, int]] = []
-    for i in range(0, len(indices), 3):
-        a, b, c = indices[i : i + 3]
-        faces.append((a, b, c))
+    faces = np.frombuffer(payload, dtype="<u2", count=idx_count, offset=ib_off).reshape(-1, 3)
 
-    return Mesh(
-        name=f"SCN0_mesh_{block['off']:x}",
+    mesh = Mesh(
+        name=f"SCN0_mesh_{int(block['off']):x}",
         decl=0,
-        vertices=vertices,
-        normals=normals,
-        uvs=uvs,
-        faces=faces,
+        vertices=pos,
+        normals=nrm,
+        uvs=uv,
+        faces=faces.astype(np.uint32),
         maps={},
         subsets=[],
         material_sets=[],
     )
+    if quantize:
+        # Normals get their own array so the full-width vertex copy can be freed.
+        mesh.normals = nrm.copy()
+        quantize_mesh(mesh)
+    return mesh
+
+def _vb_column(
+    vb: bytes, vcount: int, stride: int, at: int, comps: int, dtype: str = "<f4", *, swap_yz: bool = False
+) -> np.ndarray:
+    # Strided view of one field of an interleaved VB, copied out as float32.
+    # swap_yz reorders (x, y, z) -> (x, z, y) as part of that same copy.
+    if vcount == 0:
+        return np.zeros((0, comps), dtype=np.float32)
+    view = np.ndarray((vcount, comps), dtype=dtype, buffer=vb, offset=at, strides=(stride, np.dtype(dtype).itemsize))
+    if swap_yz:
+        return view[:, [0, 2, 1]].astype(np.float32, copy=False)
+    return view.astype(np.float32)
 
-def decode_vertex(decl: int, vb: bytes, i: int, *, flip_v: bool, swap_yz: bool) -> Tuple[Tuple[float, float, float], Optional[Tuple[float, float, float]], Optional[Tuple[float, float]]]:
-    stride = vertex_stride_from_decl(decl)
-    off = i * stride
 
-    base_sel = decl & 0x400E
-    if base_sel == 0x0002:
-        x, y, z = struct.unpack_from("<3f", vb, off)
-        off += 12
-    elif base_sel in (0x0004, 0x0006):
-        x, y, z, _w = struct.unpack_from("<4f", vb, off)
-        off += 16
-    elif base_sel == 0x0008:
-        x, y, z, _w, _t = struct.unpack_from("<5f", vb, off)
-        off += 20
-    elif base_sel == 0x000A:
-        x, y, z, _w, _t, _u = struct.unpack_from("<6f", vb, off)
-        off += 24
-    elif base_sel == 0x000C:
-        x, y, z, _w, _t, _u, _v = struct.unpack_from("<7f", vb, off)
-        off += 28
-    elif base_sel == 0x000E:
-        x, y, z, _w, _t, _u, _v, _q = struct.unpack_from("<8f", vb, off)
-        off += 32
-    else:
-        # Unknown layout; still try first 12 bytes as position.
-        x, y, z = struct.unpack_from("<3f", vb, off)
-        off += 12
+def decode_vertices_decl(
+    decl: int,
+    vb: bytes,
+    vcount: int,
+    *,
+    flip_v: bool,
+    swap_yz: bool,
+) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Decode a whole legacy-decl VB at once.
 
-    if swap_yz:
-        y, z = z, y
-    pos = (x, y, z)
+    Returns (positions[N,3], normals[N,3] or None, uvs[N,2] or None) as float32 arrays.
+    """
+
+    stride = vertex_stride_from_decl(decl)
 
-    nrm: Optional[Tuple[float, float, float]] = None
+    # Position block; unknown layouts still try the first 12 bytes as position.
+    off = _DECL_BASE_STRIDE.get(decl & 0x400E, 12)
+
+    nrm_at: Optional[int] = None
     if decl & 0x10:
-        nx, ny, nz = struct.unpack_from("<3f", vb, off)
+        nrm_at = off
         off += 12
-        if swap_yz:
-            ny, nz = nz, ny
-        nrm = (nx, ny, nz)
 
     # skip packed fields (unknown semantics)
-    if decl & 0x20:
-        off += 4
-    if decl & 0x40:
-        off += 4
-    if decl & 0x80:
-        off += 4
+    for bit in (0x20, 0x40, 0x80):
+        if decl & bit:
+            off += 4
 
-    uv: Optional[Tuple[float, float]] = None
-    uv_count = (decl >> 8) & 0xF
-    if uv_count:
+    pos = _vb_column(vb, vcount, stride, 0, 3, swap_yz=swap_yz)
+    nrm = _vb_column(vb, vcount, stride, nrm_at, 3, swap_yz=swap_yz) if nrm_at is not None else None
+
+    uv: Optional[np.ndarray] = None
+    if (decl >> 8) & 0xF:
         uv_fmt_bits = (decl >> 16) & 0xFFFF
         fmt = (uv_fmt_bits & 3) if uv_fmt_bits else 0
-        if fmt == 0:
-            u, v = struct.unpack_from("<2f", vb, off)
-            off += 8
-        elif fmt == 1:
-            u, v, _w = struct.unpack_from("<3f", vb, off)
-            off += 12
-        elif fmt == 2:
-            u, v, _w, _q = struct.unpack_from("<4f", vb, off)
-            off += 16
-        else:
-            hu = struct.unpack_from("<H", vb, off)[0]
-            hv = struct.unpack_from("<H", vb, off + 2)[0]
-            u, v = half_to_float(hu), half_to_float(hv)
-            off += 4
-
-        if flip_v:
-            v = 1.0 - v
-        uv = (u, v)
+        # fmt 0/1/2 are 2/3/4 floats with (u, v) first; fmt 3 is two halves.
+        uv = _vb_column(vb, vcount, stride, off, 2, "<f2" if fmt == 3 else "<f4")
 
+    if flip_v and uv is not None:
+        np.subtract(1.0, uv[:, 1], out=uv[:, 1])
     return pos, nrm, uv
 
 
@@ -333,31 +384,69 @@ def parse_scn_tree(data: bytes, start: int) -> int:
 
     r = Reader(data, start)
 
-    def parse_node() -> None:
+    # Walked iteratively so deep trees can't hit the recursion limit. flag2 nodes are tail
+    # positions and need no bookkeeping; `pending` counts the nodes still waiting to read
+    # their flag2 once the flag1 subtree under them is done.
+    pending = 0
+    while True:
         _name = r.cstr()
         r.skip(0x40)
         flag1 = r.u32()
         if flag1 == 1:
-            parse_node()
-        flag2 = r.u32()
-        if flag2 == 1:
-            parse_node()
-
-    parse_node()
-    return r.tell()
+            pending += 1
+            continue
+        while r.u32() != 1:  # flag2 of the innermost unfinished node
+            if pending == 0:
+                return r.tell()
+            pending -= 1
 
 
 @dataclass
 class Mesh:
     name: str
     decl: int
-    vertices: List[Tuple[float, float, float]]
-    normals: List[Optional[Tuple[float, float, float]]]
-    uvs: List[Optional[Tuple[float, float]]]
-    faces: List[Tuple[int, int, int]]  # 0-based indices
+    vertices: np.ndarray  # (N, 3) float32, or int16 when quantized (see pos_scale/pos_bias)
+    normals: Optional[np.ndarray]  # (N, 3) float32, None when the layout has no normals
+    uvs: Optional[np.ndarray]  # (N, 2) float32 (float16 when quantized), None when the layout has no TEXCOORD0
+    faces: np.ndarray  # (M, 3) uint32, 0-based indices
     maps: Dict[str, str]
     subsets: List[Dict[str, int]]
     material_sets: List[Dict[str, str]]
+    pos_scale: Optional[np.ndarray] = None  # (3,) float32, set by quantize_mesh
+    pos_bias: Optional[np.ndarray] = None  # (3,) float32, set by quantize_mesh
+
+    def positions(self) -> np.ndarray:
+        """Vertex positions as float32 (N, 3), dequantized if needed."""
+        if self.pos_scale is None:
+            return self.vertices
+        return self.vertices.astype(np.float32) * self.pos_scale + self.pos_bias
+
+
+def quantize_mesh(mesh: Mesh) -> None:
+    """
+    Shrink a mesh in place: positions become int16 with a per-axis scale/bias over the
+    mesh bounds, UVs become float16. Lossy, so only used with --quantize.
+    Meshes with non-finite positions or a span too wide for float32 are left as-is.
+    """
+
+    if mesh.pos_scale is not None or not len(mesh.vertices):
+        return
+    pos = mesh.vertices
+    if not np.isfinite(pos).all():
+        return
+    # Bounds math in float64: the span of finite float32 positions can itself overflow float32.
+    # positions() dequantizes in float32, so spans without headroom for rounding are skipped.
+    bias = pos.min(axis=0).astype(np.float64)
+    span = pos.max(axis=0) - bias
+    if (span > np.finfo(np.float32).max / 2).any():
+        return
+    scale = (span / 32767.0).astype(np.float32)
+    scale[scale == 0] = 1.0
+    mesh.vertices = np.rint((pos - bias) / scale).astype(np.int16)
+    mesh.pos_scale = scale
+    mesh.pos_bias = bias.astype(np.float32)
+    if mesh.uvs is not None:
+        mesh.uvs = mesh.uvs.astype(np.float16)
 
 
 def replace_last_suffix_with_png(name: str) -> str:
@@ -394,16 +483,26 @@ def load_image_any(src: Path) -> Optional[Image.Image]:
             return None
 
 
+def is_png_file(path: Path) -> bool:
+    try:
+        with path.open("rb") as f:
+            return f.read(8) == b"\x89PNG\r\n\x1a\n"
+    except OSError:
+        return False
+
+
 def prepare_textures_to_png(
     scn_dir: Path,
     out_dir: Path,
     *,
     maps: Dict[str, str],
     material_sets: List[Dict[str, str]],
+    texture_workers: Optional[int] = None,
 ) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
     """
     Copy/convert referenced textures into out_dir and rewrite references to .png filenames.
     Does not scan folders by extension; only processes textures explicitly referenced by the mesh.
+    texture_workers caps the conversion threads (None: executor default, 1: no threads).
     """
 
     def remap_name(tex: str) -> str:
@@ -418,6 +517,14 @@ def prepare_textures_to_png(
         dst = out_dir / dst_name
         if dst.exists():
             return dst_name
+        if src.suffix.lower() == ".png" and is_png_file(src):
+            # Already PNG: copy the bytes instead of a decode/encode round-trip.
+            out_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                shutil.copyfile(src, dst)
+                return dst_name
+            except OSError:
+                return None
         img = load_image_any(src)
         if img is None:
             return None
@@ -428,11 +535,35 @@ def prepare_textures_to_png(
         except Exception:
             return None
 
+    # Convert each referenced texture once. Names that land on the same .png are handled
+    # in reference order within one task, so the first one that converts still wins;
+    # distinct outputs are decoded/encoded in parallel (PIL/imageio release the GIL).
+    refs = [v for v in (maps or {}).values() if v]
+    refs += [v for mset in material_sets or [] for v in mset.values() if v]
+    by_dst: Dict[str, List[str]] = {}
+    for tex in refs:
+        name = Path(tex).name
+        group = by_dst.setdefault(remap_name(name), [])
+        if name not in group:
+            group.append(name)
+
+    def ensure_group(names: List[str]) -> List[Tuple[str, Optional[str]]]:
+        return [(name, ensure_one(name)) for name in names]
+
+    resolved: Dict[str, Optional[str]] = {}
+    if len(by_dst) > 1 and texture_workers != 1:
+        with ThreadPoolExecutor(max_workers=texture_workers) as ex:
+            for done in ex.map(ensure_group, by_dst.values()):
+                resolved.update(done)
+    else:
+        for names in by_dst.values():
+            resolved.update(ensure_group(names))
+
     new_maps: Dict[str, str] = {}
     for k, v in (maps or {}).items():
         if not v:
             continue
-        mapped = ensure_one(v)
+        mapped = resolved[Path(v).name]
         if mapped:
             new_maps[k] = mapped
 
@@ -442,7 +573,7 @@ def prepare_textures_to_png(
         for k, v in mset.items():
             if not v:
                 continue
-            mapped = ensure_one(v)
+            mapped = resolved[Path(v).name]
             if mapped:
                 out[k] = mapped
         new_sets.append(out)
@@ -450,6 +581,22 @@ def prepare_textures_to_png(
     return new_maps, new_sets
 
 
+def faces_from_indices(indices: np.ndarray) -> np.ndarray:
+    """
+    Build (M, 3) triangles from a decoded index buffer.
+
+    A whole number of triangles is taken as a triangle list. Anything else falls back to a
+    triangle strip: degenerate triangles are dropped and odd ones are rewound (b, a, c).
+    """
+
+    if len(indices) % 3 == 0:
+        return indices.reshape(-1, 3)
+    a, b, c = indices[:-2], indices[1:-1], indices[2:]
+    odd = (np.arange(2, len(indices)) & 1).astype(bool)
+    tris = np.stack((np.where(odd, b, a), np.where(odd, a, b), c), axis=1)
+    return tris[(a != b) & (b != c) & (a != c)]
+
+
 def extract_d3d_mesh_blocks(
     payload: bytes,
     *,
@@ -470,7 +617,6 @@ def extract_d3d_mesh_blocks(
     if len(payload) < 520 + 4 + 8:
         return meshes
 
-    seen: set[int] = set()
     # Index header variants observed:
     # - Variant A (a7==1 paths): u32 idx_fmt(0=U16,1=U32) + u32 idx_count
     # - Variant B (a7==0 paths): u32 idx_type + u32 idx_count, where idx_type maps to bytes-per-index.
@@ -478,9 +624,17 @@ def extract_d3d_mesh_blocks(
 
     # Offsets are not guaranteed to be 4-byte aligned (due to c-strings earlier in the record),
     # so scan on 2-byte alignment.
+    view = memoryview(payload)
+    # Accepted blocks never overlap: once one is taken, resume scanning at its end.
+    resume_at = 0
     for off in range(0, len(payload) - (520 + 4 + 8), 2):
-        # quick reject: end element often at element #3 for simple decls, but don't rely on it exclusively
-        maybe = parse_d3d_decl_520(payload[off : off + 520])
+        if off < resume_at:
+            continue
+        # quick reject: a decl needs a first element that is neither the end marker nor of
+        # an unknown type; the end element's position itself isn't reliable enough to test.
+        if payload[off + 4] > 17 or _UP_U16(payload, off)[0] == 0xFF:
+            continue
+        maybe = parse_d3d_decl_520(view[off : off + 520])
         if maybe is None:
             continue
         stride, elems = maybe
@@ -488,9 +642,9 @@ def extract_d3d_mesh_blocks(
         # - u32 vcount, then VB
         # - u32 0, u32 vcount, then VB
         # - u32 0, u32 0, u32 vcount, then VB
-        v0 = struct.unpack_from("<I", payload, off + 520)[0]
-        v1 = struct.unpack_from("<I", payload, off + 524)[0]
-        v2 = struct.unpack_from("<I", payload, off + 528)[0]
+        v0 = _UP_U32(payload, off + 520)[0]
+        v1 = _UP_U32(payload, off + 524)[0]
+        v2 = _UP_U32(payload, off + 528)[0]
         if 0 < v0 <= 5_000_000:
             vcount, vb_off = v0, off + 524
         elif 0 < v1 <= 5_000_000:
@@ -504,7 +658,7 @@ def extract_d3d_mesh_blocks(
         idx_hdr = vb_off + vb_size
         if idx_hdr + 8 > len(payload):
             continue
-        h0, h1 = struct.unpack_from("<II", payload, idx_hdr)
+        h0, h1 = _UP_II(payload, idx_hdr)
 
         # Try Variant A first.
         idx_fmt: Optional[int] = None
@@ -526,45 +680,17 @@ def extract_d3d_mesh_blocks(
         if end > len(payload):
             continue
 
-        # avoid duplicates if scanning overlaps
-        key = (off << 1) ^ (vcount & 0xFFFF) ^ (idx_count << 3)
-        if key in seen:
-            continue
-        seen.add(key)
+        resume_at = end
 
         vb = payload[vb_off : vb_off + vb_size]
         ib = payload[ib_off:end]
-        if idx_fmt == 0:
-            indices = list(struct.unpack_from("<" + "H" * idx_count, ib, 0))
-        else:
-            indices = list(struct.unpack_from("<" + "I" * idx_count, ib, 0))
-
-        verts: List[Tuple[float, float, float]] = []
-        nrms: List[Optional[Tuple[float, float, float]]] = []
-        uvs: List[Optional[Tuple[float, float]]] = []
-        for i in range(vcount):
-            pos, nrm, uv = decode_vertex_d3d(elems, vb, i, stride, flip_v=flip_v, swap_yz=swap_yz)
-            verts.append(pos)
-            nrms.append(nrm)
-            uvs.append(uv)
-
-        faces: List[Tuple[int, int, int]] = []
-        if len(indices) % 3 == 0:
-            for i in range(0, len(indices), 3):
-                a, b, c = indices[i : i + 3]
-                faces.append((a, b, c))
-        else:
-            for i in range(2, len(indices)):
-                a, b, c = indices[i - 2], indices[i - 1], indices[i]
-                if a == b or b == c or a == c:
-                    continue
-                if i & 1:
-                    faces.append((b, a, c))
-                else:
-                    faces.append((a, b, c))
+        indices = np.frombuffer(ib, dtype="<u2" if idx_fmt == 0 else "<u4", count=idx_count)
+
+        pos, nrm, uv = decode_vertices_d3d(elems, vb, vcount, stride, flip_v=flip_v, swap_yz=swap_yz)
+        faces = faces_from_indices(indices).astype(np.uint32)
 
         subsets: List[Dict[str, int]] = []
-        if verts and faces:
+        if len(pos) and len(faces):
             # For subset lookup, use the effective decl offset derived from vb_off.
             # This avoids false-positive decl matches that overlap the preceding subset table.
             decl_off_eff = vb_off - 524
@@ -576,9 +702,9 @@ def extract_d3d_mesh_blocks(
             Mesh(
                 name=mesh_name,
                 decl=0,
-                vertices=verts,
-                normals=nrms,
-                uvs=uvs,
+                vertices=pos,
+                normals=nrm,
+                uvs=uv,
                 faces=faces,
                 maps=maps,
                 subsets=subsets,
@@ -604,15 +730,19 @@ def find_vb_block(payload: bytes) -> Optional[Tuple[int, int, int, int, int]]:
     if len(payload) < 520 + 4 + 4 + 8:
         return None
 
-    for desc_off in range(0, len(payload) - (520 + 4 + 8), 4):
-        decl = struct.unpack_from("<I", payload, desc_off)[0]
-        stride = vertex_stride_from_decl(decl)
-        if not (12 <= stride <= 256):
-            continue
+    # First pass over every 4-byte-aligned offset in numpy: decl must give a sane stride and
+    # the dword at +520 a sane vcount. Only those offsets are checked one by one.
+    n_offs = (len(payload) - (520 + 4 + 8) + 3) // 4
+    decls = np.frombuffer(payload, dtype="<u4", count=n_offs)
+    vcounts = np.frombuffer(payload, dtype="<u4", count=n_offs, offset=520)
+    strides = vertex_strides_from_decls(decls)
+    hits = np.nonzero((strides >= 12) & (strides <= 256) & (vcounts != 0) & (vcounts <= 10_000_000))[0]
 
-        vcount = struct.unpack_from("<I", payload, desc_off + 520)[0]
-        if vcount == 0 or vcount > 10_000_000:
-            continue
+    for i in hits.tolist():
+        desc_off = i * 4
+        decl = int(decls[i])
+        stride = int(strides[i])
+        vcount = int(vcounts[i])
 
         vb_off = desc_off + 524
         vb_size = stride * vcount
@@ -620,8 +750,8 @@ def find_vb_block(payload: bytes) -> Optional[Tuple[int, int, int, int, int]]:
         if ib_hdr_off + 8 > len(payload):
             continue
 
-        idx_fmt = struct.unpack_from("<I", payload, ib_hdr_off)[0]
-        idx_count = struct.unpack_from("<I", payload, ib_hdr_off + 4)[0]
+        idx_fmt = _UP_U32(payload, ib_hdr_off)[0]
+        idx_count = _UP_U32(payload, ib_hdr_off + 4)[0]
         if idx_count == 0 or idx_count > 100_000_000:
             continue
 
@@ -645,7 +775,38 @@ def find_vb_block(payload: bytes) -> Optional[Tuple[int, int, int, int, int]]:
     return None
 
 
-def parse_d3d_decl_520(block: bytes) -> Optional[Tuple[int, List[Tuple[int, int, int, int, int, int]]]]:
+# D3DVERTEXELEMENT9: stream, offset, type, method, usage, usage index.
+_D3D_DECL_ELEMENT = np.dtype(
+    [("stream", "<u2"), ("offset", "<u2"), ("typ", "u1"), ("method", "u1"), ("usage", "u1"), ("usage_idx", "u1")]
+)
+
+# D3DDECLTYPE sizes (D3D9), indexed by type.
+_D3D_DECL_TYPE_SIZE = np.array(
+    [
+        4,   # FLOAT1
+        8,   # FLOAT2
+        12,  # FLOAT3
+        16,  # FLOAT4
+        4,   # D3DCOLOR
+        4,   # UBYTE4
+        4,   # SHORT2
+        4,   # SHORT4
+        8,   # UBYTE4N
+        8,   # SHORT2N
+        16,  # SHORT4N
+        4,   # USHORT2N
+        4,   # USHORT4N
+        4,   # UDEC3
+        4,   # DEC3N
+        8,   # FLOAT16_2
+        8,   # FLOAT16_4 (often 8? Some impl treat as 8/16; keep conservative)
+        8,   # UNUSED/other
+    ],
+    dtype=np.int64,
+)
+
+
+def parse_d3d_decl_520(block: Union[bytes, memoryview]) -> Optional[Tuple[int, List[Tuple[int, int, int, int, int, int]]]]:
     """
     Parse a 520-byte D3D9-like vertex declaration block:
       65 * D3DVERTEXELEMENT9 (8 bytes each)
@@ -656,106 +817,80 @@ def parse_d3d_decl_520(block: bytes) -> Optional[Tuple[int, List[Tuple[int, int,
     if len(block) != 520:
         return None
 
-    elems: List[Tuple[int, int, int, int, int, int]] = []
-    end_found = False
-    for i in range(65):
-        off = i * 8
-        stream, offset = struct.unpack_from("<HH", block, off)
-        typ, method, usage, usage_idx = struct.unpack_from("<BBBB", block, off + 4)
-        elems.append((stream, offset, typ, method, usage, usage_idx))
-        if stream == 0xFF:
-            end_found = True
-            break
-
-    if not end_found:
+    decl = np.frombuffer(block, dtype=_D3D_DECL_ELEMENT)
+    stream = decl["stream"]
+    is_end = stream == 0xFF
+    end_idx = int(np.argmax(is_end))
+    if not is_end[end_idx]:
         return None
 
-    # D3DDECLTYPE sizes (D3D9)
-    type_size = {
-        0: 4,   # FLOAT1
-        1: 8,   # FLOAT2
-        2: 12,  # FLOAT3
-        3: 16,  # FLOAT4
-        4: 4,   # D3DCOLOR
-        5: 4,   # UBYTE4
-        6: 4,   # SHORT2
-        7: 4,   # SHORT4
-        8: 8,   # UBYTE4N
-        9: 8,   # SHORT2N
-        10: 16, # SHORT4N
-        11: 4,  # USHORT2N
-        12: 4,  # USHORT4N
-        13: 4,  # UDEC3
-        14: 4,  # DEC3N
-        15: 8,  # FLOAT16_2
-        16: 8,  # FLOAT16_4 (often 8? Some impl treat as 8/16; keep conservative)
-        17: 8,  # UNUSED/other
-    }
+    typ = decl["typ"][:end_idx]
+    if typ.size and int(typ.max()) >= len(_D3D_DECL_TYPE_SIZE):
+        return None
 
+    # We only support stream 0 for export.
+    on_stream0 = stream[:end_idx] == 0
     stride = 0
-    for stream, offset, typ, _method, _usage, _usage_idx in elems:
-        if stream == 0xFF:
-            break
-        sz = type_size.get(typ)
-        if sz is None:
-            return None
-        # We only support stream 0 for export.
-        if stream != 0:
-            continue
-        stride = max(stride, offset + sz)
+    if on_stream0.any():
+        sizes = _D3D_DECL_TYPE_SIZE[typ[on_stream0]]
+        stride = int((decl["offset"][:end_idx][on_stream0] + sizes).max())
 
     if stride <= 0 or stride > 1024:
         return None
+    elems: List[Tuple[int, int, int, int, int, int]] = decl[: end_idx + 1].tolist()
     return stride, elems
 
 
-def decode_vertex_d3d(elems: List[Tuple[int, int, int, int, int, int]], vb: bytes, i: int, stride: int, *, flip_v: bool, swap_yz: bool) -> Tuple[Tuple[float, float, float], Optional[Tuple[float, float, float]], Optional[Tuple[float, float]]]:
+def decode_vertices_d3d(
+    elems: List[Tuple[int, int, int, int, int, int]],
+    vb: bytes,
+    vcount: int,
+    stride: int,
+    *,
+    flip_v: bool,
+    swap_yz: bool,
+) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
     """
-    Minimal D3D9 vertex decoder for common usage:
+    Minimal D3D9 vertex decoder for common usage, decoding the whole VB at once:
       Usage 0: POSITION (FLOAT3)
       Usage 3: NORMAL (FLOAT3)
       Usage 5: TEXCOORD0 (FLOAT2)
-    """
 
-    base = i * stride
-    pos: Optional[Tuple[float, float, float]] = None
-    nrm: Optional[Tuple[float, float, float]] = None
-    uv: Optional[Tuple[float, float]] = None
+    Returns (positions[N,3], normals[N,3] or None, uvs[N,2] or None) as float32 arrays.
+    Missing POSITION decodes as zeros.
+    """
 
+    # The decl is the same for every vertex: pick the element offsets once.
+    pos_at: Optional[int] = None
+    nrm_at: Optional[int] = None
+    uv_at: Optional[int] = None
     for stream, offset, typ, _method, usage, usage_idx in elems:
         if stream == 0xFF:
             break
         if stream != 0:
             continue
-        at = base + offset
-        if usage == 0 and pos is None:
-            # POSITION
+        if usage == 0 and pos_at is None:
             if typ == 2:
-                x, y, z = struct.unpack_from("<3f", vb, at)
-                if swap_yz:
-                    y, z = z, y
-                pos = (x, y, z)
-        elif usage == 3 and nrm is None:
-            # NORMAL
+                pos_at = offset
+        elif usage == 3 and nrm_at is None:
             if typ == 2:
-                nx, ny, nz = struct.unpack_from("<3f", vb, at)
-                if swap_yz:
-                    ny, nz = nz, ny
-                nrm = (nx, ny, nz)
-        elif usage == 5 and usage_idx == 0 and uv is None:
-            # TEXCOORD0
+                nrm_at = offset
+        elif usage == 5 and usage_idx == 0 and uv_at is None:
             if typ == 1:
-                u, v = struct.unpack_from("<2f", vb, at)
-                if flip_v:
-                    v = 1.0 - v
-                uv = (u, v)
+                uv_at = offset
 
-    if pos is None:
-        pos = (0.0, 0.0, 0.0)
+    if pos_at is not None:
+        pos = _vb_column(vb, vcount, stride, pos_at, 3, swap_yz=swap_yz)
+    else:
+        pos = np.zeros((vcount, 3), dtype=np.float32)
+    nrm = _vb_column(vb, vcount, stride, nrm_at, 3, swap_yz=swap_yz) if nrm_at is not None else None
+    uv = _vb_column(vb, vcount, stride, uv_at, 2) if uv_at is not None else None
+    if flip_v and uv is not None:
+        np.subtract(1.0, uv[:, 1], out=uv[:, 1])
     return pos, nrm, uv
 
 
-def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional[Mesh]:
+def parse_mesh_record(record: Union[bytes, memoryview], *, flip_v: bool, swap_yz: bool, scan_embedded: bool = True) -> Optional[Mesh]:
     """
     SCN1 mesh record (as passed to CDCMgr::LoadMesh with a3==1):
       u32 size
@@ -765,6 +900,9 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
 
     We only rely on (size, name) and then a heuristic to locate:
       vertex_desc[520] + u32 vertex_count + vertex_data + (u32 idx_fmt,u32 idx_count) + index_data
+
+    scan_embedded=False skips the embedded-block scan (path A2), for callers that already
+    ran extract_d3d_mesh_blocks over this payload and found nothing.
     """
 
     if len(record) < 12:
@@ -774,10 +912,10 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
         pass
 
     name_off = 8
-    nul = record.find(b"\x00", name_off)
+    nul = _find_nul(record, name_off)
     if nul < 0:
         return None
-    name = record[name_off:nul].decode("utf-8", "replace") or "mesh"
+    name = str(record[name_off:nul], "utf-8", "replace") or "mesh"
     payload = record[nul + 1 :]
 
     # Path A (SCN1 extra meshes / a7==1): 520-byte D3D decl + u32 vcount + vb + (u32 fmt,u32 count)+ib
@@ -785,9 +923,9 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
         maybe = parse_d3d_decl_520(payload[:520])
         if maybe is not None:
             stride, elems = maybe
-            v0 = struct.unpack_from("<I", payload, 520)[0]
-            v1 = struct.unpack_from("<I", payload, 524)[0] if len(payload) >= 520 + 8 else 0
-            v2 = struct.unpack_from("<I", payload, 528)[0] if len(payload) >= 520 + 12 else 0
+            v0 = _UP_U32(payload, 520)[0]
+            v1 = _UP_U32(payload, 524)[0] if len(payload) >= 520 + 8 else 0
+            v2 = _UP_U32(payload, 528)[0] if len(payload) >= 520 + 12 else 0
             if 0 < v0 <= 5_000_000:
                 vcount, vb_off = v0, 524
             elif 0 < v1 <= 5_000_000:
@@ -796,7 +934,7 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
                 vcount, vb_off = v2, 532
             vb_size = stride * vcount
             if vb_off + vb_size + 8 <= len(payload):
-                idx_fmt, idx_count = struct.unpack_from("<II", payload, vb_off + vb_size)
+                idx_fmt, idx_count = _UP_II(payload, vb_off + vb_size)
                 if idx_fmt in (0, 1):
                     idx_size = 2 if idx_fmt == 0 else 4
                     ib_off = vb_off + vb_size + 8
@@ -804,41 +942,17 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
                     if ib_off + ib_size <= len(payload):
                         vb = payload[vb_off : vb_off + vb_size]
                         ib = payload[ib_off : ib_off + ib_size]
-                        if idx_fmt == 0:
-                            indices = list(struct.unpack_from("<" + "H" * idx_count, ib, 0))
-                        else:
-                            indices = list(struct.unpack_from("<" + "I" * idx_count, ib, 0))
-
-                        verts: List[Tuple[float, float, float]] = []
-                        nrms: List[Optional[Tuple[float, float, float]]] = []
-                        uvs: List[Optional[Tuple[float, float]]] = []
-                        for i in range(vcount):
-                            pos, nrm, uv = decode_vertex_d3d(elems, vb, i, stride, flip_v=flip_v, swap_yz=swap_yz)
-                            verts.append(pos)
-                            nrms.append(nrm)
-                            uvs.append(uv)
-
-                        faces: List[Tuple[int, int, int]] = []
-                        if len(indices) % 3 == 0:
-                            for i in range(0, len(indices), 3):
-                                a, b, c = indices[i : i + 3]
-                                faces.append((a, b, c))
-                        else:
-                            for i in range(2, len(indices)):
-                                a, b, c = indices[i - 2], indices[i - 1], indices[i]
-                                if a == b or b == c or a == c:
-                                    continue
-                                if i & 1:
-                                    faces.append((b, a, c))
-                                else:
-                                    faces.append((a, b, c))
+                        indices = np.frombuffer(ib, dtype="<u2" if idx_fmt == 0 else "<u4", count=idx_count)
+
+                        pos, nrm, uv = decode_vertices_d3d(elems, vb, vcount, stride, flip_v=flip_v, swap_yz=swap_yz)
+                        faces = faces_from_indices(indices).astype(np.uint32)
 
                         return Mesh(
                             name=name,
                             decl=0,
-                            vertices=verts,
-                            normals=nrms,
-                            uvs=uvs,
+                            vertices=pos,
+                            normals=nrm,
+                            uvs=uv,
                             faces=faces,
                             maps={},
                             subsets=[],
@@ -846,7 +960,7 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
                         )
 
     # Path A2: Some records embed the mesh block at a non-zero offset (e.g. ou01U).
-    embedded = extract_d3d_mesh_blocks(payload, flip_v=flip_v, swap_yz=swap_yz, name_prefix=name, maps=None)
+    embedded = extract_d3d_mesh_blocks(payload, flip_v=flip_v, swap_yz=swap_yz, name_prefix=name, maps=None) if scan_embedded else []
     if embedded:
         # return the first; higher-level code can rescan for multiple if needed
         return embedded[0]
@@ -860,90 +974,57 @@ def parse_mesh_record(record: bytes, *, flip_v: bool, swap_yz: bool) -> Optional
     vb_off = desc_off + 524
     vb = payload[vb_off : vb_off + stride * vcount]
 
-    idx_fmt = struct.unpack_from("<I", payload, ib_hdr_off)[0]
-    idx_count = struct.unpack_from("<I", payload, ib_hdr_off + 4)[0]
+    idx_fmt = _UP_U32(payload, ib_hdr_off)[0]
+    idx_count = _UP_U32(payload, ib_hdr_off + 4)[0]
     idx_data = payload[ib_hdr_off + 8 : end_off]
-    if idx_fmt == 0:
-        indices = list(struct.unpack_from("<" + "H" * idx_count, idx_data, 0))
-    else:
-        indices = list(struct.unpack_from("<" + "I" * idx_count, idx_data, 0))
-
-    verts: List[Tuple[float, float, float]] = []
-    nrms: List[Optional[Tuple[float, float, float]]] = []
-    uvs: List[Optional[Tuple[float, float]]] = []
-    for i in range(vcount):
-        pos, nrm, uv = decode_vertex(decl, vb, i, flip_v=flip_v, swap_yz=swap_yz)
-        verts.append(pos)
-        nrms.append(nrm)
-        uvs.append(uv)
-
-    faces: List[Tuple[int, int, int]] = []
-    if len(indices) % 3 == 0:
-        for i in range(0, len(indices), 3):
-            a, b, c = indices[i : i + 3]
-            faces.append((a, b, c))
-    else:
-        # Fallback: treat as triangle strip.
-        for i in range(2, len(indices)):
-            a, b, c = indices[i - 2], indices[i - 1], indices[i]
-            if a == b or b == c or a == c:
-                continue
-            if i & 1:
-                faces.append((b, a, c))
-            else:
-                faces.append((a, b, c))
+    indices = np.frombuffer(idx_data, dtype="<u2" if idx_fmt == 0 else "<u4", count=idx_count)
+
+    pos, nrm, uv = decode_vertices_decl(decl, vb, vcount, flip_v=flip_v, swap_yz=swap_yz)
+    faces = faces_from_indices(indices).astype(np.uint32)
 
     return Mesh(
         name=name,
         decl=decl,
-        vertices=verts,
-        normals=nrms,
-        uvs=uvs,
+        vertices=pos,
+        normals=nrm,
+        uvs=uv,
         faces=faces,
         maps={},
-        subsets=find_subset_table(payload, decl_off=desc_off, vcount=vcount, face_count=len(faces)) if verts and faces else [],
+        subsets=find_subset_table(payload, decl_off=desc_off, vcount=vcount, face_count=len(faces)) if len(pos) and len(faces) else [],
         material_sets=[],
     )
 
 
+_MTL_NAME_CHARS = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_.:/+-")
+_MTL_NAME_BAD_RUN = re.compile(r"[^0-9A-Za-z_.:/+-]+")
+
+
 def sanitize_mtl_name(s: str) -> str:
     s = s.strip().replace("\\", "/")
-    s = re.sub(r"[^0-9A-Za-z_.:/+-]+", "_", s)
+    # Most names are already clean; only run the regex when something needs replacing.
+    if not _MTL_NAME_CHARS.issuperset(s):
+        s = _MTL_NAME_BAD_RUN.sub("_", s)
     if not s:
         return "mat"
     return s
 
 
-def extract_texture_maps(record_bytes: bytes) -> Dict[str, str]:
-    """
-    Pull texture filenames from a SCN record's raw bytes.
+_TEXTURE_MAP_KEYS = ("ColorMap", "NormalMap", "LuminosityMap", "ReflectionMap")
+_TEXTURE_MAP_KEY_ALT = b"|".join(k.encode("ascii") for k in _TEXTURE_MAP_KEYS)
+# A map value: the cstr right after the key, 1..260 bytes of tab/printable ASCII, with no
+# extension check (binding/copying uses the parsed material blocks instead). Captured in a
+# lookahead (empty group when it doesn't qualify) so only "<key>\0" is consumed.
+_TEXTURE_MAP_VALUE = b"(?=([\t\x20-\x7e]{1,260})\x00|)"
+_NUL = re.compile(b"\x00")
 
-    We key by semantic name found in the file:
-      ColorMap -> diffuse (map_Kd)
-      NormalMap -> normal/bump
-      LuminosityMap -> emissive-ish
-      ReflectionMap -> reflection-ish
-    """
 
-    keys = ["ColorMap", "NormalMap", "LuminosityMap", "ReflectionMap"]
-    out: Dict[str, str] = {}
-    for key in keys:
-        needle = (key + "\x00").encode("ascii")
-        pos = 0
-        while True:
-            idx = record_bytes.find(needle, pos)
-            if idx < 0:
-                break
-            s_start = idx + len(needle)
-            s_end = record_bytes.find(b"\x00", s_start)
-            if s_end > s_start:
-                # Keep this purely as a string extractor. Do not validate by extension here.
-                # (Binding/copying uses the parsed material blocks instead.)
-                val = record_bytes[s_start:s_end].decode("utf-8", "replace")
-                if 1 <= len(val) <= 260 and all((c == "\t" or 32 <= ord(c) < 127) for c in val):
-                    out.setdefault(key, val)
-            pos = idx + 1
-    return out
+def _find_nul(buf: Union[bytes, memoryview], start: int) -> int:
+    # bytes.find(b"\x00", start) that also works on memoryviews (records are zero-copy views).
+    m = _NUL.search(buf, start)
+    return m.start() if m else -1
+
+
+_AUTO_BLOCK_TAG = b"auto\x00"
 
 
 def extract_auto_material_blocks(record_bytes: bytes) -> List[Dict[str, object]]:
@@ -960,46 +1041,52 @@ def extract_auto_material_blocks(record_bytes: bytes) -> List[Dict[str, object]]
     """
 
     blocks: List[Dict[str, object]] = []
-    needle = b"auto\x00"
     start = 0
-
-    def read_cstr(buf: bytes, ofs: int) -> Tuple[str, int]:
-        end = buf.find(b"\x00", ofs)
-        if end < 0:
-            raise ValueError("unterminated cstr")
-        return buf[ofs:end].decode("utf-8", "replace"), end + 1
-
     while True:
-        idx = record_bytes.find(needle, start)
-        if idx < 0:
-            break
+        idx = record_bytes.find(_AUTO_BLOCK_TAG, start)
         # require room for entry_count
-        if idx + 5 + 4 > len(record_bytes):
+        if idx < 0 or idx + 5 + 4 > len(record_bytes):
             break
-        try:
-            entry_count = struct.unpack_from("<I", record_bytes, idx + 5)[0]
-            # sanity: typical values are small (3~4)
-            if entry_count == 0 or entry_count > 64:
-                start = idx + 1
-                continue
-            ofs = idx + 9
-            entries: List[Dict[str, object]] = []
-            for _ in range(entry_count):
-                key, ofs = read_cstr(record_bytes, ofs)
-                val, ofs = read_cstr(record_bytes, ofs)
-                flag1 = struct.unpack_from("<I", record_bytes, ofs)[0]
-                flag2 = struct.unpack_from("<I", record_bytes, ofs + 4)[0]
-                ofs += 8
-                entries.append({"key": key, "value": val, "flag1": flag1, "flag2": flag2})
-            blocks.append({"off": idx, "entry_count": entry_count, "entries": entries})
-            start = idx + 1
-        except Exception:
-            # If parsing fails, keep scanning.
-            start = idx + 1
+        parsed = _parse_auto_block(record_bytes, idx)
+        if parsed is None:
+            # The tag can't overlap itself, so resume right after it.
+            start = idx + len(_AUTO_BLOCK_TAG)
+            continue
+        block, start = parsed
+        blocks.append(block)
 
     return blocks
 
 
+def _read_cstr_at(buf: Union[bytes, memoryview], ofs: int) -> Tuple[str, int]:
+    end = _find_nul(buf, ofs)
+    if end < 0:
+        raise ValueError("unterminated cstr")
+    return str(buf[ofs:end], "utf-8", "replace"), end + 1
+
+
+def _parse_auto_block(buf: Union[bytes, memoryview], idx: int) -> Optional[Tuple[Dict[str, object], int]]:
+    # One "auto" block whose tag starts at idx, with the offset just past its entries;
+    # None if it doesn't parse.
+    try:
+        entry_count = _UP_U32(buf, idx + 5)[0]
+        # sanity: typical values are small (3~4)
+        if entry_count == 0 or entry_count > 64:
+            return None
+        ofs = idx + 9
+        entries: List[Dict[str, object]] = []
+        for _ in range(entry_count):
+            key, ofs = _read_cstr_at(buf, ofs)
+            val, ofs = _read_cstr_at(buf, ofs)
+            flag1, flag2 = _UP_II(buf, ofs)
+            ofs += 8
+            entries.append({"key": key, "value": val, "flag1": flag1, "flag2": flag2})
+        return {"off": idx, "entry_count": entry_count, "entries": entries}, ofs
+    except Exception:
+        # If parsing fails, keep scanning.
+        return None
+
+
 def auto_blocks_to_material_sets(blocks: List[Dict[str, object]]) -> List[Dict[str, str]]:
     out: List[Dict[str, str]] = []
     for b in blocks:
@@ -1013,6 +1100,78 @@ def auto_blocks_to_material_sets(blocks: List[Dict[str, object]]) -> List[Dict[s
     return out
 
 
+@dataclass
+class ParsedRecord:
+    maps: Dict[str, str]
+    material_sets: List[Dict[str, str]]
+
+
+_RECORD_TAG = re.compile(b"(" + _TEXTURE_MAP_KEY_ALT + b"|auto)\x00" + _TEXTURE_MAP_VALUE)
+
+
+def _scan_record(rec: Union[bytes, memoryview]) -> ParsedRecord:
+    """
+    Texture maps and "auto" material sets of one SCN1 record, from a single pass over its bytes.
+
+    Map keys (ColorMap -> map_Kd, NormalMap -> bump, LuminosityMap -> emissive-ish,
+    ReflectionMap -> reflection-ish) keep their first acceptable value. The tags can't
+    overlap (each ends in the only NUL), so one finditer sees every map key and every
+    extract_auto_material_blocks hit.
+    """
+
+    maps: Dict[str, str] = {}
+    auto_blocks: List[Dict[str, object]] = []
+    auto_end = 0
+    for m in _RECORD_TAG.finditer(rec):
+        tag, val = m.groups()
+        if tag == b"auto":
+            idx = m.start()
+            # Tags inside an already-parsed auto block belong to it (map keys there still count).
+            if idx < auto_end or idx + 5 + 4 > len(rec):
+                continue
+            parsed = _parse_auto_block(rec, idx)
+            if parsed is not None:
+                block, auto_end = parsed
+                auto_blocks.append(block)
+        elif val is not None:
+            maps.setdefault(tag.decode("ascii"), val.decode("ascii"))
+    return ParsedRecord(
+        maps={key: maps[key] for key in _TEXTURE_MAP_KEYS if key in maps},
+        material_sets=auto_blocks_to_material_sets(auto_blocks),
+    )
+
+
+def _parse_full_record(rec: Union[bytes, memoryview], *, flip_v: bool, swap_yz: bool, fallback_name: str) -> List[Mesh]:
+    """
+    Meshes of one SCN1 main-list record, with the record's maps/material sets attached.
+
+    Main records can contain multiple embedded mesh blocks (LOD/high-low etc.); only when
+    there are none does the record go through parse_mesh_record, which then skips its own
+    rescan for them. The tag scan (_scan_record) also runs once per record.
+    """
+
+    name_end = _find_nul(rec, 8)
+    rec_name = str(rec[8:name_end], "utf-8", "replace") if name_end > 8 else fallback_name
+    payload = rec[name_end + 1 :] if name_end > 0 else b""
+    pr = _scan_record(rec)
+    embedded = extract_d3d_mesh_blocks(
+        payload,
+        flip_v=flip_v,
+        swap_yz=swap_yz,
+        name_prefix=rec_name,
+        maps=pr.maps,
+        material_sets=pr.material_sets,
+    )
+    if embedded:
+        return embedded
+    mesh = parse_mesh_record(rec, flip_v=flip_v, swap_yz=swap_yz, scan_embedded=False)
+    if mesh is None or not len(mesh.vertices) or not len(mesh.faces):
+        return []
+    mesh.maps = pr.maps
+    mesh.material_sets = pr.material_sets
+    return [mesh]
+
+
 def find_subset_table(payload: bytes, decl_off: int, vcount: int, face_count: Optional[int] = None) -> List[Dict[str, int]]:
     """
     Find subset/material table right before a D3D mesh block.
@@ -1031,65 +1190,120 @@ def find_subset_table(payload: bytes, decl_off: int, vcount: int, face_count: Op
     if search_end <= search_start:
         return best
 
-    for off in range(search_start, search_end, 4):
-        subset_count = struct.unpack_from("<I", payload, off)[0]
-        if subset_count == 0 or subset_count > 256:
+    # The window is validated as a whole on a u32 view: each word gets a flag saying whether
+    # an entry starting there fails the per-entry checks, and per-column running totals of
+    # those flags (one column per word offset mod entry size) give the number of failing
+    # entries in any candidate table with two lookups.
+    words = np.frombuffer(
+        payload, dtype="<u4", count=max(0, (min(decl_off, len(payload)) - search_start) // 4), offset=search_start
+    ).astype(np.int64)
+    n_words = min((search_end - search_start + 3) // 4, len(words))
+    counts = words[:n_words]
+    hits = np.nonzero((counts != 0) & (counts <= 256))[0]
+    subset_counts = counts[hits]
+
+    best_end = -1
+    best_at = (0, 0, 0)
+    for entry_size in (20, 16):
+        k = entry_size // 4
+        if len(words) < k:
             continue
-        for entry_size in (20, 16):
-            table_bytes = 4 + subset_count * entry_size
-            if off + table_bytes > decl_off:
-                continue
+        rows = sliding_window_view(words, k)
+        start_tri, tri_count, base_v = rows[:, 1], rows[:, 2], rows[:, 3]
+        bad = (base_v > vcount) | (start_tri > 100_000_000) | (tri_count == 0) | (tri_count > 100_000_000)
+        if entry_size == 20:
+            bad |= rows[:, 4] != vcount
+        if face_count is not None:
+            bad |= (start_tri + tri_count) > face_count
+        n_rows = -(-len(bad) // k)
+        cols = np.zeros((n_rows + 1, k), dtype=np.int64)
+        cols[1:].reshape(-1)[: len(bad)] = bad
+        np.cumsum(cols, axis=0, out=cols)
+
+        first = hits + 1
+        table_end = first + subset_counts * k
+        fits = table_end <= len(words)
+        r0 = first[fits] // k
+        col = first[fits] % k
+        valid = (cols[r0 + subset_counts[fits], col] - cols[r0, col]) == 0
+        if not valid.any():
+            continue
+        # Prefer the closest table to decl_off; ties keep the earliest candidate.
+        ends = table_end[fits][valid]
+        i = int(np.argmax(ends))
+        h = int(hits[fits][valid][i])
+        if ends[i] > best_end or (ends[i] == best_end and h < best_at[0]):
+            best_end = int(ends[i])
+            best_at = (h, int(subset_counts[fits][valid][i]), k)
+
+    if best_end >= 0:
+        h, subset_count, k = best_at
+        for m_id, start_tri, tri_count, base_v in words[h + 1 : best_end].reshape(subset_count, k)[:, :4].tolist():
+            best.append(
+                {
+                    "material_id": m_id,
+                    "start_tri": start_tri,
+                    "tri_count": tri_count,
+                    "base_vertex": base_v,
+                }
+            )
+    return best
 
-            ok = True
-            entries: List[Dict[str, int]] = []
-            max_end = 0
-            sum_tris = 0
-            for i in range(subset_count):
-                if entry_size == 20:
-                    m_id, start_tri, tri_count, base_v, vcnt = struct.unpack_from("<5I", payload, off + 4 + i * 20)
-                    if vcnt != vcount:
-                        ok = False
-                        break
-                else:
-                    m_id, start_tri, tri_count, base_v = struct.unpack_from("<4I", payload, off + 4 + i * 16)
-
-                if base_v > vcount:
-                    ok = False
-                    break
-                if start_tri > 100_000_000 or tri_count > 100_000_000 or tri_count == 0:
-                    ok = False
-                    break
-                if face_count is not None and (start_tri + tri_count) > face_count:
-                    ok = False
-                    break
-
-                max_end = max(max_end, start_tri + tri_count)
-                sum_tris += tri_count
-                entries.append(
-                    {
-                        "material_id": int(m_id),
-                        "start_tri": int(start_tri),
-                        "tri_count": int(tri_count),
-                        "base_vertex": int(base_v),
-                    }
-                )
-
-            if not ok:
-                continue
 
-            # Heuristic: table matches if it covers a reasonable number of triangles (non-zero), and sits close to decl.
-            if sum_tris == 0 or max_end == 0:
-                continue
-            # Prefer the closest table to decl_off.
-            if not best or (decl_off - (off + table_bytes)) < (decl_off - (best[0]["_end_off"])):  # type: ignore[index]
-                if entries:
-                    entries[0]["_end_off"] = off + table_bytes  # type: ignore[typeddict-item]
-                best = entries
-
-    # strip helper key
-    if best and "_end_off" in best[0]:
-        best[0].pop("_end_off", None)  # type: ignore[arg-type]
-    return best
+def format_obj_vectors(tag: str, rows: np.ndarray) -> str:
+    """Format an (N, k) float array as OBJ "<tag> %.6f ..." lines in one batch."""
+
+    if not len(rows):
+        return ""
+    line = tag + " %.6f" * rows.shape[1] + "\n"
+    return (line * len(rows)) % tuple(rows.ravel().tolist())
+
+
+_OBJ_FACE_LINE = "f %d/%d/%d %d/%d/%d %d/%d/%d\n"
+
+
+def format_obj_faces(faces: np.ndarray, v_base: int, vt_base: int, vn_base: int) -> str:
+    """
+    Format (M, 3) 0-based faces as OBJ "f v/vt/vn ..." lines in one batch, with the
+    given 1-based index bases for each attribute.
+    """
+
+    if not len(faces):
+        return ""
+    a = faces.astype(np.int64)
+    if v_base == vt_base == vn_base:
+        # The usual case (shared vertex/uv/normal indexing): each index just repeats 3x.
+        rows = np.repeat(a + v_base, 3, axis=1)
+    else:
+        rows = np.stack((a + v_base, a + vt_base, a + vn_base), axis=-1).reshape(-1, 9)
+    return (_OBJ_FACE_LINE * len(rows)) % tuple(rows.ravel().tolist())
+
+
+def _basename_fwd(s: str) -> str:
+    """Last component of a texture reference, splitting on both '\\' and '/'."""
+
+    return s.rsplit("\\", 1)[-1].rsplit("/", 1)[-1]
+
+
+# MTL statement emitted for each texture map key, in output order.
+_MTL_MAP_STATEMENTS = (
+    ("ColorMap", "map_Kd"),
+    ("NormalMap", "map_Bump"),
+    ("LuminosityMap", "map_Ke"),
+    ("ReflectionMap", "# ReflectionMap"),
+)
+
+
+def format_mtl_entry(name: str, maps: Dict[str, str]) -> str:
+    """
+    Format one MTL entry: "newmtl", a white diffuse colour and the texture map lines
+    (basename only, no directories), terminated by a blank line.
+    """
+
+    lines = [f"newmtl {name}\n", "Kd 1.000000 1.000000 1.000000\n"]
+    lines += [f"{stmt} {_basename_fwd(v)}\n" for key, stmt in _MTL_MAP_STATEMENTS if (v := maps.get(key))]
+    lines.append("\n")
+    return "".join(lines)
 
 
 def write_obj(out_dir: Path, base_name: str, meshes: List[Mesh], mesh_to_tex: Dict[int, str]) -> None:
@@ -1111,21 +1325,7 @@ def write_obj(out_dir: Path, base_name: str, meshes: List[Mesh], mesh_to_tex: Di
                     mtl = sanitize_mtl_name(f"{base_name}_{i}_{mesh.name}_mat{mid}")
                     local_names[mid] = mtl
                     mset = mesh.material_sets[mid] if mid < len(mesh.material_sets) else {}
-                    tex = mset.get("ColorMap")
-                    f.write(f"newmtl {mtl}\n")
-                    f.write("Kd 1.000000 1.000000 1.000000\n")
-                    if tex:
-                        f.write(f"map_Kd {Path(tex).name}\n")
-                    nrm = mset.get("NormalMap")
-                    if nrm:
-                        f.write(f"map_Bump {Path(nrm).name}\n")
-                    lum = mset.get("LuminosityMap")
-                    if lum:
-                        f.write(f"map_Ke {Path(lum).name}\n")
-                    ref = mset.get("ReflectionMap")
-                    if ref:
-                        f.write(f"# ReflectionMap {Path(ref).name}\n")
-                    f.write("\n")
+                    f.write(format_mtl_entry(mtl, mset))
                 mtl_names.append("")  # placeholder; actual mapping stored in per_mesh_material_map
                 per_mesh_material_map.append(local_names)
             else:
@@ -1133,84 +1333,54 @@ def write_obj(out_dir: Path, base_name: str, meshes: List[Mesh], mesh_to_tex: Di
                 mtl = sanitize_mtl_name(f"{base_name}_{i}_{mesh.name}")
                 mtl_names.append(mtl)
                 per_mesh_material_map.append(None)
-                f.write(f"newmtl {mtl}\n")
-                f.write("Kd 1.000000 1.000000 1.000000\n")
-                if tex:
-                    tex_norm = Path(tex).name.replace("\\", "/")
-                    f.write(f"map_Kd {tex_norm}\n")
-                nrm = mesh.maps.get("NormalMap")
-                if nrm:
-                    f.write(f"map_Bump {Path(nrm).name.replace('\\\\','/')}\n")
-                lum = mesh.maps.get("LuminosityMap")
-                if lum:
-                    f.write(f"map_Ke {Path(lum).name.replace('\\\\','/')}\n")
-                ref = mesh.maps.get("ReflectionMap")
-                if ref:
-                    f.write(f"# ReflectionMap {Path(ref).name.replace('\\\\','/')}\n")
-                f.write("\n")
+                f.write(format_mtl_entry(mtl, {**mesh.maps, "ColorMap": tex} if tex else mesh.maps))
 
     # OBJ: global index space
     v_base = 1
     vt_base = 1
     vn_base = 1
 
-    with obj_path.open("w", encoding="utf-8", newline="\n") as f:
-        f.write(f"mtllib {mtl_path.name}\n")
-        for mi, mesh in enumerate(meshes):
-            f.write(f"o {sanitize_mtl_name(mesh.name)}\n")
-            local_map = per_mesh_material_map[mi]
-            if not local_map:
-                f.write(f"usemtl {mtl_names[mi]}\n")
-            for (x, y, z) in mesh.vertices:
-                f.write(f"v {x:.6f} {y:.6f} {z:.6f}\n")
-            for uv in mesh.uvs:
-                if uv is None:
-                    f.write("vt 0.000000 0.000000\n")
-                else:
-                    u, v = uv
-                    f.write(f"vt {u:.6f} {v:.6f}\n")
-            for nrm in mesh.normals:
-                if nrm is None:
-                    f.write("vn 0.000000 0.000000 1.000000\n")
-                else:
-                    nx, ny, nz = nrm
-                    f.write(f"vn {nx:.6f} {ny:.6f} {nz:.6f}\n")
-
-            if mesh.subsets and local_map:
-                for s in mesh.subsets:
-                    mid = s["material_id"]
-                    start_tri = s["start_tri"]
-                    tri_count = s["tri_count"]
-                    mtl = local_map.get(mid)
-                    if mtl:
-                        f.write(f"usemtl {mtl}\n")
-                    for a, b, c in mesh.faces[start_tri : start_tri + tri_count]:
-                        fa = v_base + a
-                        fb = v_base + b
-                        fc = v_base + c
-                        fta = vt_base + a
-                        ftb = vt_base + b
-                        ftc = vt_base + c
-                        fna = vn_base + a
-                        fnb = vn_base + b
-                        fnc = vn_base + c
-                        f.write(f"f {fa}/{fta}/{fna} {fb}/{ftb}/{fnb} {fc}/{ftc}/{fnc}\n")
-            else:
-                for a, b, c in mesh.faces:
-                    fa = v_base + a
-                    fb = v_base + b
-                    fc = v_base + c
-                    fta = vt_base + a
-                    ftb = vt_base + b
-                    ftc = vt_base + c
-                    fna = vn_base + a
-                    fnb = vn_base + b
-                    fnc = vn_base + c
-                    f.write(f"f {fa}/{fta}/{fna} {fb}/{ftb}/{fnb} {fc}/{ftc}/{fnc}\n")
-
-            v_base += len(mesh.vertices)
-            vt_base += len(mesh.vertices)
-            vn_base += len(mesh.vertices)
+    # The OBJ text is assembled section by section and written in one call: no per-line
+    # encoder or buffer work, and a single large write for the OS.
+    out: List[str] = []
+    out.append(f"mtllib {mtl_path.name}\n")
+    for mi, mesh in enumerate(meshes):
+        out.append(f"o {sanitize_mtl_name(mesh.name)}\n")
+        local_map = per_mesh_material_map[mi]
+        if not local_map:
+            out.append(f"usemtl {mtl_names[mi]}\n")
+        out.append(format_obj_vectors("v", mesh.positions()))
+        if mesh.uvs is None:
+            out.append("vt 0.000000 0.000000\n" * len(mesh.vertices))
+        else:
+            out.append(format_obj_vectors("vt", mesh.uvs))
+        if mesh.normals is None:
+            out.append("vn 0.000000 0.000000 1.000000\n" * len(mesh.vertices))
+        else:
+            out.append(format_obj_vectors("vn", mesh.normals))
+
+        if mesh.subsets and local_map:
+            for s in mesh.subsets:
+                mid = s["material_id"]
+                start_tri = s["start_tri"]
+                tri_count = s["tri_count"]
+                mtl = local_map.get(mid)
+                if mtl:
+                    out.append(f"usemtl {mtl}\n")
+                out.append(format_obj_faces(mesh.faces[start_tri : start_tri + tri_count], v_base, vt_base, vn_base))
+        else:
+            out.append(format_obj_faces(mesh.faces, v_base, vt_base, vn_base))
+
+        v_base += len(mesh.vertices)
+        vt_base += len(mesh.vertices)
+        vn_base += len(mesh.vertices)
+
+    obj_path.write_bytes("".join(out).encode("utf-8"))
+
+
+# Texture family entries: PREFIX_<int>.EXT (matched on raw bytes, decoded only on a hit).
+_TEX_FAMILY_NAME = re.compile(rb"^([A-Za-z0-9]+)_([0-9]+)\.([A-Za-z0-9]{2,5})$")
+_TRAILING_INDEX = re.compile(r"_([0-9]+)\.")
 
 
 def infer_scn0_material_color_maps(data: bytes, *, base_hint: Optional[str] = None) -> Dict[int, str]:
@@ -1226,32 +1396,35 @@ def infer_scn0_material_color_maps(data: bytes, *, base_hint: Optional[str] = No
     Note: This does not scan folders or rely on fixed extensions; it uses strings embedded in the .scn itself.
     """
 
-    def iter_cstrings(max_len: int = 260) -> Iterable[str]:
-        i = 0
-        n = len(data)
-        while i < n:
-            b = data[i]
-            if 32 <= b < 127:
-                j = i
-                while j < n and data[j] != 0 and (32 <= data[j] < 127) and (j - i) < max_len:
-                    j += 1
-                if j < n and data[j] == 0 and j - i >= 4:
-                    s = data[i:j].decode("ascii", "ignore")
-                    # Keep only "filename-like" strings (cheap filter).
-                    if any(c.isalpha() for c in s) and ("." in s) and ("/" not in s) and ("\\" not in s):
-                        yield s
-                    i = j + 1
-                    continue
-            i += 1
+    def iter_cstrings(max_len: int = 260) -> Iterable[bytes]:
+        # NUL-terminated printable-ASCII runs of at least 4 chars; a run longer than max_len
+        # yields only its last max_len chars. Run bounds are found with numpy, so Python only
+        # touches the accepted strings.
+        buf = np.frombuffer(data, dtype=np.uint8)
+        printable = (buf >= 32) & (buf < 127)
+        run_starts = np.flatnonzero(printable & ~np.concatenate(([False], printable[:-1])))
+        nuls = np.flatnonzero(buf == 0)
+        nuls = nuls[nuls > 0]
+        ends = nuls[printable[nuls - 1]]
+        starts = run_starts[np.searchsorted(run_starts, ends - 1, side="right") - 1]
+        keep = ends - starts >= 4
+        starts = np.maximum(starts[keep], ends[keep] - max_len)
+        for i, j in zip(starts.tolist(), ends[keep].tolist()):
+            s = data[i:j]
+            # Keep only "filename-like" strings (cheap filter); s.lower() != s.upper() iff s has a letter.
+            if b"." in s and b"/" not in s and b"\\" not in s and s.lower() != s.upper():
+                yield s
 
     # 1) Gather candidate texture filenames by pattern: PREFIX_<int>.EXT
-    tex_pat = re.compile(r"^([A-Za-z0-9]+)_([0-9]+)\.([A-Za-z0-9]{2,5})$")
     by_prefix: Dict[str, Dict[int, str]] = {}
-    for s in iter_cstrings():
-        m = tex_pat.match(s)
+    for raw in iter_cstrings():
+        if b"_" not in raw:
+            continue
+        m = _TEX_FAMILY_NAME.match(raw)
         if not m:
             continue
-        prefix, idx_s, _ext = m.group(1), m.group(2), m.group(3)
+        s = raw.decode("ascii")
+        prefix, idx_s = m.group(1).decode("ascii"), m.group(2)
         try:
             idx = int(idx_s)
         except ValueError:
@@ -1326,7 +1499,7 @@ def choose_scn0_material_sets(data: bytes, *, base_hint: Optional[str]) -> List[
                 best[cm] = m
 
         def trailing_idx(name: str) -> Tuple[int, str]:
-            mm = re.search(r"_([0-9]+)\.", name)
+            mm = _TRAILING_INDEX.search(name)
             if not mm:
                 return (10**9, name.lower())
             return (int(mm.group(1)), name.lower())
@@ -1337,6 +1510,31 @@ def choose_scn0_material_sets(data: bytes, *, base_hint: Optional[str]) -> List[
     return list(color_maps_to_material_sets(color_maps))
 
 
+def _texture_range_candidates(data: bytes, pos: int) -> np.ndarray:
+    """
+    Candidate (start_tri, tri_count, base_vertex, vertex_count) quads in the 64 bytes before a
+    texture name at pos: one per 4-byte step back from pos - 16, nearest first, as int64 rows.
+    """
+
+    back_start = max(0, pos - 64)
+    if pos - 16 < back_start:
+        return np.zeros((0, 4), dtype=np.int64)
+    k = (pos - 16 - back_start) // 4 + 1
+    words = np.frombuffer(data, dtype="<u4", count=k + 3, offset=pos - 16 - 4 * (k - 1))
+    return sliding_window_view(words, 4)[::-1].astype(np.int64)
+
+
+def _best_texture_range(quads: np.ndarray, ok: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    # Highest (tri_count, vertex_count) among the accepted quads; ties go to the nearest one.
+    if not ok.any():
+        return None
+    q = quads[ok]
+    top = q[:, 1] == q[:, 1].max()
+    top &= q[:, 3] == q[top, 3].max()
+    start_tri, tri_count, base_v, v_cnt = q[int(np.argmax(top))].tolist()
+    return start_tri, tri_count, base_v, v_cnt
+
+
 def infer_scn0_subset_requirements_from_texture_blocks(
     data: bytes, *, color_maps: Dict[int, str]
 ) -> Tuple[int, int]:
@@ -1353,19 +1551,8 @@ def infer_scn0_subset_requirements_from_texture_blocks(
         pos = data.find(needle)
         if pos < 0:
             continue
-        best: Optional[Tuple[int, int, int, int]] = None
-        best_score = (-1, -1)
-        back_start = max(0, pos - 64)
-        for ofs in range(pos - 16, back_start - 1, -4):
-            if ofs < 0 or ofs + 16 > len(data):
-                continue
-            start_tri, tri_count, base_v, v_cnt = struct.unpack_from("<4I", data, ofs)
-            if tri_count <= 0 or v_cnt <= 0:
-                continue
-            score = (tri_count, v_cnt)
-            if score > best_score:
-                best_score = score
-                best = (start_tri, tri_count, base_v, v_cnt)
+        quads = _texture_range_candidates(data, pos)
+        best = _best_texture_range(quads, (quads[:, 1] > 0) & (quads[:, 3] > 0))
         if best:
             start_tri, tri_count, base_v, v_cnt = best
             req_faces = max(req_faces, int(start_tri + tri_count))
@@ -1394,34 +1581,24 @@ def infer_scn0_subsets_from_texture_blocks(
     if not color_maps or vcount <= 0 or face_count <= 0:
         return []
 
-    def candidate_ok(start_tri: int, tri_count: int, base_v: int, v_cnt: int) -> bool:
-        if tri_count <= 0 or tri_count > face_count:
-            return False
-        if start_tri >= face_count or start_tri + tri_count > face_count:
-            return False
-        if v_cnt <= 0 or base_v >= vcount or base_v + v_cnt > vcount:
-            return False
-        return True
-
     subsets: List[Dict[str, int]] = []
     for material_id, tex in sorted(color_maps.items()):
         needle = tex.encode("ascii", "ignore") + b"\x00"
         pos = data.find(needle)
         if pos < 0:
             continue
-        best: Optional[Tuple[int, int, int, int]] = None
-        best_score = (-1, -1)  # (tri_count, v_cnt)
-        back_start = max(0, pos - 64)
-        for ofs in range(pos - 16, back_start - 1, -4):
-            if ofs < 0 or ofs + 16 > len(data):
-                continue
-            start_tri, tri_count, base_v, v_cnt = struct.unpack_from("<4I", data, ofs)
-            if not candidate_ok(start_tri, tri_count, base_v, v_cnt):
-                continue
-            score = (tri_count, v_cnt)
-            if score > best_score:
-                best_score = score
-                best = (start_tri, tri_count, base_v, v_cnt)
+        quads = _texture_range_candidates(data, pos)
+        start_tri, tri_count, base_v, v_cnt = quads.T
+        ok = (
+            (tri_count > 0)
+            & (tri_count <= face_count)
+            & (start_tri < face_count)
+            & (start_tri + tri_count <= face_count)
+            & (v_cnt > 0)
+            & (base_v < vcount)
+            & (base_v + v_cnt <= vcount)
+        )
+        best = _best_texture_range(quads, ok)
         if best:
             start_tri, tri_count, base_v, v_cnt = best
             subsets.append(
@@ -1439,7 +1616,9 @@ def infer_scn0_subsets_from_texture_blocks(
 
 
 
-def write_mesh_package(out_dir: Path, scn_dir: Path, base_name: str, mesh: Mesh) -> None:
+def write_mesh_package(
+    out_dir: Path, scn_dir: Path, base_name: str, mesh: Mesh, *, texture_workers: Optional[int] = None
+) -> None:
     """
     Write a single mesh as its own OBJ/MTL pair into out_dir.
 
@@ -1454,7 +1633,11 @@ def write_mesh_package(out_dir: Path, scn_dir: Path, base_name: str, mesh: Mesh)
 
     # Convert/copy textures to PNG and rewrite references.
     maps, material_sets = prepare_textures_to_png(
-        scn_dir, out_dir, maps=dict(mesh.maps or {}), material_sets=list(mesh.material_sets or [])
+        scn_dir,
+        out_dir,
+        maps=dict(mesh.maps or {}),
+        material_sets=list(mesh.material_sets or []),
+        texture_workers=texture_workers,
     )
 
     obj_path = out_dir / f"{safe_base}.obj"
@@ -1465,71 +1648,81 @@ def write_mesh_package(out_dir: Path, scn_dir: Path, base_name: str, mesh: Mesh)
         if mesh.subsets and material_sets:
             used_ids = sorted({s['material_id'] for s in mesh.subsets})
             for mid in used_ids:
-                mtl = sanitize_mtl_name(f"{safe_base}_mat{mid}")
+                mtl = f"{safe_base}_mat{mid}"
                 per_mesh_material_map[mid] = mtl
                 mset = material_sets[mid] if mid < len(material_sets) else {}
-                f.write(f"newmtl {mtl}\n")
-                f.write('Kd 1.000000 1.000000 1.000000\n')
-                if (tex := mset.get('ColorMap')):
-                    f.write(f"map_Kd {Path(tex).name}\n")
-                if (nrm := mset.get('NormalMap')):
-                    f.write(f"map_Bump {Path(nrm).name}\n")
-                if (lum := mset.get('LuminosityMap')):
-                    f.write(f"map_Ke {Path(lum).name}\n")
-                if (ref := mset.get('ReflectionMap')):
-                    f.write(f"# ReflectionMap {Path(ref).name}\n")
-                f.write('\n')
+                f.write(format_mtl_entry(mtl, mset))
         else:
-            mtl = sanitize_mtl_name(f"{safe_base}_mat0")
+            mtl = f"{safe_base}_mat0"
             per_mesh_material_map[0] = mtl
-            f.write(f"newmtl {mtl}\n")
-            f.write('Kd 1.000000 1.000000 1.000000\n')
-            if (tex := maps.get('ColorMap')):
-                f.write(f"map_Kd {Path(tex).name}\n")
-            if (nrm := maps.get('NormalMap')):
-                f.write(f"map_Bump {Path(nrm).name}\n")
-            if (lum := maps.get('LuminosityMap')):
-                f.write(f"map_Ke {Path(lum).name}\n")
-            if (ref := maps.get('ReflectionMap')):
-                f.write(f"# ReflectionMap {Path(ref).name}\n")
-            f.write('\n')
-
-        with obj_path.open('w', encoding='utf-8', newline='\n') as f:
-            f.write(f"mtllib {mtl_path.name}\n")
-            f.write(f"o {safe_base}\n")
-            for (x, y, z) in mesh.vertices:
-                f.write(f"v {x:.6f} {y:.6f} {z:.6f}\n")
-            for uv in mesh.uvs:
-                if uv is None:
-                    f.write('vt 0.000000 0.000000\n')
-                else:
-                    u, v = uv
-                    f.write(f"vt {u:.6f} {v:.6f}\n")
-            for nrm in mesh.normals:
-                if nrm is None:
-                    f.write('vn 0.000000 0.000000 1.000000\n')
-                else:
-                    nx, ny, nz = nrm
-                    f.write(f"vn {nx:.6f} {ny:.6f} {nz:.6f}\n")
-
-            if mesh.subsets and per_mesh_material_map:
-                for s in mesh.subsets:
-                    mid = s['material_id']
-                    if (mtl := per_mesh_material_map.get(mid)):
-                        f.write(f"usemtl {mtl}\n")
-                    start_tri = s['start_tri']
-                    tri_count = s['tri_count']
-                    for a, b, c in mesh.faces[start_tri : start_tri + tri_count]:
-                        fa, fb, fc = a + 1, b + 1, c + 1
-                        f.write(f"f {fa}/{fa}/{fa} {fb}/{fb}/{fb} {fc}/{fc}/{fc}\n")
-            else:
-                if (mtl := per_mesh_material_map.get(0)):
-                    f.write(f"usemtl {mtl}\n")
-                for a, b, c in mesh.faces:
-                    fa, fb, fc = a + 1, b + 1, c + 1
-                    f.write(f"f {fa}/{fa}/{fa} {fb}/{fb}/{fb} {fc}/{fc}/{fc}\n")
+            f.write(format_mtl_entry(mtl, maps))
+
+        out: List[str] = []
+        out.append(f"mtllib {mtl_path.name}\n")
+        out.append(f"o {safe_base}\n")
+        out.append(format_obj_vectors("v", mesh.positions()))
+        if mesh.uvs is None:
+            out.append('vt 0.000000 0.000000\n' * len(mesh.vertices))
+        else:
+            out.append(format_obj_vectors("vt", mesh.uvs))
+        if mesh.normals is None:
+            out.append('vn 0.000000 0.000000 1.000000\n' * len(mesh.vertices))
+        else:
+            out.append(format_obj_vectors("vn", mesh.normals))
+
+        if mesh.subsets and per_mesh_material_map:
+            for s in mesh.subsets:
+                mid = s['material_id']
+                if (mtl := per_mesh_material_map.get(mid)):
+                    out.append(f"usemtl {mtl}\n")
+                start_tri = s['start_tri']
+                tri_count = s['tri_count']
+                out.append(format_obj_faces(mesh.faces[start_tri : start_tri + tri_count], 1, 1, 1))
+        else:
+            if (mtl := per_mesh_material_map.get(0)):
+                out.append(f"usemtl {mtl}\n")
+            out.append(format_obj_faces(mesh.faces, 1, 1, 1))
+
+        obj_path.write_bytes("".join(out).encode("utf-8"))
 
-def parse_scn1(path: Path, *, flip_v: bool, swap_yz: bool) -> Tuple[List[Mesh], Dict[int, str]]:
+
+def replace_mesh_package(
+    out_dir: Path, scn_dir: Path, base_name: str, mesh: Mesh, *, texture_workers: Optional[int] = None
+) -> None:
+    """
+    Write the package into a private staging directory, then swap it in for out_dir.
+
+    Files of a previous run are only removed once the new package is complete, so an
+    interrupted or failed conversion never leaves a half-written out_dir behind.
+    """
+
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    # Scratch dir next to out_dir (same filesystem, so the swaps are renames). Its random,
+    # dot-prefixed name can't collide with another stem's output or another worker's scratch.
+    scratch = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=f".{out_dir.name}."))
+    try:
+        staged = scratch / "new"
+        write_mesh_package(staged, scn_dir, base_name, mesh, texture_workers=texture_workers)
+        if out_dir.exists():
+            try:
+                os.replace(out_dir, scratch / "old")
+            except OSError:
+                # The old package can't be moved (e.g. a file held open on Windows): clear
+                # what can be cleared and overwrite file by file, as a plain rerun would.
+                shutil.rmtree(out_dir, ignore_errors=True)
+                out_dir.mkdir(exist_ok=True)
+                for p in staged.iterdir():
+                    os.replace(p, out_dir / p.name)
+                return
+        os.replace(staged, out_dir)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def parse_scn1(
+    path: Path, *, flip_v: bool, swap_yz: bool, quantize: bool = False
+) -> Tuple[List[Mesh], Dict[int, str]]:
+    """Parse every mesh of an SCN1 file; with quantize, each one is held quantized from decode on."""
     data = path.read_bytes()
     r = Reader(data, 0)
     magic = r.bytes(4)
@@ -1580,30 +1773,12 @@ def parse_scn1(path: Path, *, flip_v: bool, swap_yz: bool) -> Tuple[List[Mesh],
     mesh_count = r.u32()
     meshes: List[Mesh] = []
     for _ in range(mesh_count):
-        rec_size = r.u32()
-        rec = struct.pack("<I", rec_size) + r.bytes(rec_size - 4)
-        # Some main records can contain multiple embedded mesh blocks (LOD/high-low etc.).
-        name_end = rec.find(b"\x00", 8)
-        rec_name = rec[8:name_end].decode("utf-8", "replace") if name_end > 8 else f"rec_{len(meshes)}"
-        payload = rec[name_end + 1 :] if name_end > 0 else b""
-        maps = extract_texture_maps(rec)
-        material_sets = auto_blocks_to_material_sets(extract_auto_material_blocks(rec))
-        embedded = extract_d3d_mesh_blocks(
-            payload,
-            flip_v=flip_v,
-            swap_yz=swap_yz,
-            name_prefix=rec_name,
-            maps=maps,
-            material_sets=material_sets,
-        )
-        if embedded:
-            meshes.extend(embedded)
-        else:
-            mesh = parse_mesh_record(rec, flip_v=flip_v, swap_yz=swap_yz)
-            if mesh is not None and mesh.vertices and mesh.faces:
-                mesh.maps = maps
-                mesh.material_sets = material_sets
-                meshes.append(mesh)
+        rec = r.record()
+        rec_meshes = _parse_full_record(rec, flip_v=flip_v, swap_yz=swap_yz, fallback_name=f"rec_{len(meshes)}")
+        if quantize:
+            for mesh in rec_meshes:
+                quantize_mesh(mesh)
+        meshes.extend(rec_meshes)
 
     # 6) mapping block: (mesh_index, container_index, cstr texture), sentinel -1
     mapping_count = r.u32()
@@ -1619,22 +1794,122 @@ def parse_scn1(path: Path, *, flip_v: bool, swap_yz: bool) -> Tuple[List[Mesh],
     # 7) extra mesh list: record + trailing cstr per entry
     extra_count = r.u32()
     for _ in range(extra_count):
-        rec_size = r.u32()
-        rec = struct.pack("<I", rec_size) + r.bytes(rec_size - 4)
+        rec = r.record()
         extra_mesh = parse_mesh_record(rec, flip_v=flip_v, swap_yz=swap_yz)
         _extra_name = r.cstr()
-        if extra_mesh is not None and extra_mesh.vertices and extra_mesh.faces:
-            extra_mesh.maps = extract_texture_maps(rec)
-            extra_mesh.material_sets = auto_blocks_to_material_sets(extract_auto_material_blocks(rec))
+        if extra_mesh is not None and len(extra_mesh.vertices) and len(extra_mesh.faces):
+            pr = _scan_record(rec)
+            extra_mesh.maps = pr.maps
+            extra_mesh.material_sets = pr.material_sets
+            if quantize:
+                quantize_mesh(extra_mesh)
             meshes.append(extra_mesh)
 
     return meshes, mesh_to_tex
 
 
+# Asset prefix of an SCN0 file stem (e.g. "ou06" from "ou06A"), used as the texture family hint.
+_SCN_STEM_PREFIX = re.compile(r"^([A-Za-z]{2}\d{2})")
+
+
+def convert_scn_file(
+    scn_path: Path, out_root: Path, *, quantize: bool = False, texture_workers: Optional[int] = None
+) -> None:
+    """Convert one .scn file into out_root/scn0|scn1/<stem>/; failures are reported, not raised."""
+
+    try:
+        data = scn_path.read_bytes()
+        head = data[:4]
+        if head == b"SCN1":
+            meshes, _mesh_to_tex = parse_scn1(scn_path, flip_v=True, swap_yz=False, quantize=quantize)
+            # Prefer the structurally complete high LOD (segmented materials + multiple ColorMaps),
+            # then fall back to largest geometry.
+            hi = [m for m in meshes if (m.subsets and m.material_sets)]
+            rich = []
+            for m in hi:
+                color_maps = {ms.get("ColorMap") for ms in m.material_sets if ms.get("ColorMap")}
+                rich.append((len(color_maps), len(m.subsets), len(m.vertices), len(m.faces), m))
+            if rich:
+                # Prefer more distinct ColorMaps (e.g. E_0 + E_1), then more subsets.
+                mesh = max(rich, key=lambda t: (t[0], t[1], t[2], t[3]))[-1]
+            else:
+                mesh = max(meshes, key=lambda m: (len(m.vertices), len(m.faces)))
+            out_dir = out_root / "scn1" / scn_path.stem
+            replace_mesh_package(out_dir, scn_path.parent, scn_path.stem, mesh, texture_workers=texture_workers)
+        elif head == b"SCN0":
+            tree_end = parse_scn_tree(data, 4)
+            # No fallback/guesses: only use the known high-LOD block format (stride32 + tag 101/102).
+            stride32_blocks = scan_scn0_stride32_mesh_blocks(data, start=tree_end)
+            if not len(stride32_blocks):
+                return
+
+            m0 = _SCN_STEM_PREFIX.match(scn_path.stem)
+            base_hint = m0.group(1) if m0 else None
+            material_sets = choose_scn0_material_sets(data, base_hint=base_hint)
+            inferred_name = scn_path.stem
+
+            cmaps = {
+                i: mset.get("ColorMap", "")
+                for i, mset in enumerate(material_sets)
+                if mset.get("ColorMap")
+            }
+            req_faces, req_verts = infer_scn0_subset_requirements_from_texture_blocks(data, color_maps=cmaps)
+
+            face_counts = stride32_blocks["ib_bytes"] // 2 // 3
+            fits = (stride32_blocks["vcount"] >= req_verts) & (face_counts >= req_faces)
+            if fits.any():
+                stride32_blocks, face_counts = stride32_blocks[fits], face_counts[fits]
+            # Largest (face count, vcount), first block on ties; vcount < 2**32 by construction.
+            rank = (face_counts << 32) + stride32_blocks["vcount"]
+            chosen_block = stride32_blocks[int(np.argmax(rank))]
+            mesh = decode_scn0_stride32_mesh_block(
+                data, chosen_block, flip_v=True, swap_yz=False, quantize=quantize
+            )
+            mesh.name = inferred_name
+
+            if material_sets:
+                mesh.material_sets = list(material_sets)
+                if not mesh.subsets and len(mesh.material_sets) > 1 and cmaps:
+                    mesh.subsets = infer_scn0_subsets_from_texture_blocks(
+                        data,
+                        vcount=len(mesh.vertices),
+                        face_count=len(mesh.faces),
+                        color_maps=cmaps,
+                    )
+                if not mesh.subsets and len(mesh.material_sets) > 1:
+                    mesh.maps = dict(mesh.material_sets[0])
+                    mesh.material_sets = []
+
+            out_dir = out_root / "scn0" / scn_path.stem
+            replace_mesh_package(out_dir, scn_path.parent, scn_path.stem, mesh, texture_workers=texture_workers)
+        else:
+            return
+    except Exception as e:
+        print(f"[!] Failed: {scn_path} ({e})")
+
+
+def convert_scn_files(
+    scn_paths: List[Path], out_root: Path, *, quantize: bool = False, texture_workers: Optional[int] = None
+) -> None:
+    for scn_path in scn_paths:
+        convert_scn_file(scn_path, out_root, quantize=quantize, texture_workers=texture_workers)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Convert SCN0/SCN1 (*.scn) to OBJ+MTL (high LOD).")
     ap.add_argument("input_dir", type=Path, help="Input folder (recursively scans .scn files)")
     ap.add_argument("output_dir", type=Path, help="Output folder")
+    ap.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Hold positions as int16 (+scale/bias) and UVs as float16 in memory (lossy, smaller)",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for converting files (default: CPU count; 1 = no pool)",
+    )
     args = ap.parse_args()
 
     in_dir: Path = args.input_dir
@@ -1644,85 +1919,27 @@ def main() -> int:
     out_root.mkdir(parents=True, exist_ok=True)
 
     scn_paths = sorted(in_dir.rglob("*.scn"))
+    # Files are independent, so convert them on a process pool; --jobs 1 stays in-process.
+    # Output folders are keyed by stem, so same-stem files share one task and keep their
+    # sorted order (the last one wins, as in a sequential run).
+    by_stem: Dict[str, List[Path]] = {}
     for scn_path in scn_paths:
-        try:
-            data = scn_path.read_bytes()
-            head = data[:4]
-            if head == b"SCN1":
-                meshes, _mesh_to_tex = parse_scn1(scn_path, flip_v=True, swap_yz=False)
-                # Prefer the structurally complete high LOD (segmented materials + multiple ColorMaps),
-                # then fall back to largest geometry.
-                hi = [m for m in meshes if (m.subsets and m.material_sets)]
-                rich = []
-                for m in hi:
-                    color_maps = {ms.get("ColorMap") for ms in m.material_sets if ms.get("ColorMap")}
-                    rich.append((len(color_maps), len(m.subsets), len(m.vertices), len(m.faces), m))
-                if rich:
-                    # Prefer more distinct ColorMaps (e.g. E_0 + E_1), then more subsets.
-                    mesh = max(rich, key=lambda t: (t[0], t[1], t[2], t[3]))[-1]
-                else:
-                    mesh = max(meshes, key=lambda m: (len(m.vertices), len(m.faces)))
-                out_dir = out_root / "scn1" / scn_path.stem
-                if out_dir.exists():
-                    shutil.rmtree(out_dir, ignore_errors=True)
-                out_dir.mkdir(parents=True, exist_ok=True)
-                write_mesh_package(out_dir, scn_path.parent, scn_path.stem, mesh)
-            elif head == b"SCN0":
-                tree_end = parse_scn_tree(data, 4)
-                # No fallback/guesses: only use the known high-LOD block format (stride32 + tag 101/102).
-                stride32_blocks = scan_scn0_stride32_mesh_blocks(data, start=tree_end)
-                if not stride32_blocks:
-                    continue
-
-                m0 = re.match(r"^([A-Za-z]{2}\d{2})", scn_path.stem)
-                base_hint = m0.group(1) if m0 else None
-                material_sets = choose_scn0_material_sets(data, base_hint=base_hint)
-                inferred_name = scn_path.stem
-
-                cmaps = {
-                    i: mset.get("ColorMap", "")
-                    for i, mset in enumerate(material_sets)
-                    if mset.get("ColorMap")
-                }
-                req_faces, req_verts = infer_scn0_subset_requirements_from_texture_blocks(data, color_maps=cmaps)
-
-                def blk_face_count(b: Dict[str, int]) -> int:
-                    return int(b.get("ib_bytes", 0)) // 2 // 3
-
-                candidates = [
-                    b
-                    for b in stride32_blocks
-                    if int(b.get("vcount", 0)) >= req_verts and blk_face_count(b) >= req_faces
-                ]
-                chosen_block = max(
-                    candidates or stride32_blocks,
-                    key=lambda b: (blk_face_count(b), int(b.get("vcount", 0))),
-                )
-                mesh = decode_scn0_stride32_mesh_block(data, chosen_block, flip_v=True, swap_yz=False)
-                mesh.name = inferred_name
-
-                if material_sets:
-                    mesh.material_sets = list(material_sets)
-                    if not mesh.subsets and len(mesh.material_sets) > 1 and cmaps:
-                        mesh.subsets = infer_scn0_subsets_from_texture_blocks(
-                            data,
-                            vcount=len(mesh.vertices),
-                            face_count=len(mesh.faces),
-                            color_maps=cmaps,
-                        )
-                    if not mesh.subsets and len(mesh.material_sets) > 1:
-                        mesh.maps = dict(mesh.material_sets[0])
-                        mesh.material_sets = []
-
-                out_dir = out_root / "scn0" / scn_path.stem
-                if out_dir.exists():
-                    shutil.rmtree(out_dir, ignore_errors=True)
-                out_dir.mkdir(parents=True, exist_ok=True)
-                write_mesh_package(out_dir, scn_path.parent, scn_path.stem, mesh)
-            else:
-                continue
-        except Exception as e:
-            print(f"[!] Failed: {scn_path} ({e})")
+        by_stem.setdefault(scn_path.stem, []).append(scn_path)
+    cpus = os.cpu_count() or 1
+    jobs = args.jobs or cpus
+    if jobs > 1 and len(by_stem) > 1:
+        # Each worker gets its share of the CPUs for texture threads, so the total stays
+        # near cpu_count instead of jobs * cpu_count.
+        convert = partial(
+            convert_scn_files, out_root=out_root, quantize=args.quantize, texture_workers=max(1, cpus // jobs)
+        )
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            for _ in ex.map(convert, by_stem.values()):
+                pass
+    else:
+        convert = partial(convert_scn_files, out_root=out_root, quantize=args.quantize)
+        for group in by_stem.values():
+            convert(group)
 
     print(f"Wrote: {out_root}")
     return 0
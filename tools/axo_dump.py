@@ -5,17 +5,37 @@
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import struct
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+# Precompiled readers for the header/record layouts parsed below.
+U32 = struct.Struct("<I")
+FILE_HDR = struct.Struct("<8I")  # INFO chunk header, AXO_, version, unk24, unk28
+CHUNK_HDR = struct.Struct("<4I")  # tag, size, count, unk_c
+GEOM_HDR = struct.Struct("<8I")
+
+
 def u32le(buf: bytes, off: int) -> int:
-    return struct.unpack_from("<I", buf, off)[0]
+    return U32.unpack_from(buf, off)[0]
 
 
+# Only a handful of distinct tags ever occur, so the decoded names are memoized.
+@lru_cache(maxsize=1024)
 def fourcc(u: int) -> str:
-    return struct.pack("<I", u).decode("ascii", "replace")
+    return U32.pack(u).decode("ascii", "replace")
+
+
+def map_file(path: Path) -> bytes | mmap.mmap:
+    # Read-only memory map of the file; empty files can't be mapped and come back as b"".
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 @dataclass(frozen=True)
@@ -45,23 +65,18 @@ TAG_FRAM = 0x4D415246  # "FRAM"
 def parse_header(buf: bytes) -> tuple[int, int, int]:
     if len(buf) < 0x20:
         raise ValueError("file too small")
-    if u32le(buf, 0x00) != TAG_INFO:
+    hdr = FILE_HDR.unpack_from(buf, 0)
+    if hdr[0] != TAG_INFO:
         raise ValueError("missing INFO")
-    if u32le(buf, 0x10) != TAG_AXO_:
+    if hdr[4] != TAG_AXO_:
         raise ValueError("missing AXO_ at +0x10")
-    version = u32le(buf, 0x14)
-    unk24 = u32le(buf, 0x18)
-    unk28 = u32le(buf, 0x1C)
-    return version, unk24, unk28
+    return hdr[5], hdr[6], hdr[7]
 
 
 def parse_chunk_at(buf: bytes, off: int) -> Chunk:
     if off + 16 > len(buf):
         raise ValueError("chunk header out of range")
-    tag = u32le(buf, off + 0)
-    size = u32le(buf, off + 4)
-    count = u32le(buf, off + 8)
-    unk_c = u32le(buf, off + 12)
+    tag, size, count, unk_c = CHUNK_HDR.unpack_from(buf, off)
     return Chunk(off, tag, size, count, unk_c)
 
 
@@ -92,37 +107,53 @@ def parse_geog_children(buf: bytes, geog_off: int) -> list[Chunk]:
     return out
 
 
+# TEX record (36 bytes): u32 id, char[32] NUL-padded name
+TEX_REC = struct.Struct("<I32s")
+
+
 def parse_tex(buf: bytes, tex_off: int) -> list[tuple[int, str]]:
     if u32le(buf, tex_off) != TAG_TEX_:
         return []
     count = u32le(buf, tex_off + 8)
-    out: list[tuple[int, str]] = []
     off = tex_off + 16
-    for _ in range(count):
-        if off + 36 > len(buf):
-            break
-        tid = u32le(buf, off)
-        name_raw = buf[off + 4 : off + 36]
-        name = name_raw.split(b"\x00", 1)[0].decode("ascii", "replace")
-        out.append((tid, name))
-        off += 36
-    return out
+    # Records past the end of the buffer are dropped; the table is read through a view.
+    n = max(0, min(count, (len(buf) - off) // TEX_REC.size))
+    with memoryview(buf) as mv:
+        return [
+            (tid, name_raw.split(b"\x00", 1)[0].decode("ascii", "replace"))
+            for tid, name_raw in TEX_REC.iter_unpack(mv[off : off + n * TEX_REC.size])
+        ]
+
+
+# MTRL record (68 bytes): u32 key, i32 unk4, ..., u32 tex_id at +0x3C, ...
+MTRL_REC = struct.Struct("<Ii52xI4x")
 
 
 def parse_mtrl(buf: bytes, mtrl_off: int) -> list[tuple[int, int, int]]:
     if u32le(buf, mtrl_off) != TAG_MTRL:
         return []
     count = u32le(buf, mtrl_off + 8)
-    out: list[tuple[int, int, int]] = []
     off = mtrl_off + 16
-    for _ in range(count):
-        if off + 68 > len(buf):
-            break
-        key = u32le(buf, off + 0)
-        unk4 = struct.unpack_from("<i", buf, off + 4)[0]
-        tex_id = u32le(buf, off + 15 * 4)
-        out.append((key, tex_id, unk4))
-        off += 68
+    # Records past the end of the buffer are dropped.
+    n = max(0, min(count, (len(buf) - off) // MTRL_REC.size))
+    return [(key, tex_id, unk4) for key, unk4, tex_id in MTRL_REC.iter_unpack(buf[off : off + n * MTRL_REC.size])]
+
+
+def decode_atom_records(table: bytes, rec_size: int) -> list[dict[str, int]]:
+    # ATOM records are rec_size // 8 (fourcc tag, u32 value) pairs; all records are
+    # unpacked in one iter_unpack pass over the table.
+    if not table:
+        return []
+    rec = struct.Struct(f"<{rec_size // 4}I")
+    out: list[dict[str, int]] = []
+    tags: tuple[int, ...] = ()
+    names: list[str] = []
+    for fields in rec.iter_unpack(table):
+        # Records of one ATOM normally share a tag sequence; only re-derive names on change.
+        if fields[0::2] != tags:
+            tags = fields[0::2]
+            names = [fourcc(t) for t in tags]
+        out.append(dict(zip(names, fields[1::2])))
     return out
 
 
@@ -134,20 +165,10 @@ def parse_atom(buf: bytes, atom: Chunk) -> list[dict[str, int]]:
     if rec_size <= 0 or rec_count <= 0 or (rec_size % 8) != 0:
         return []
 
-    pairs_per_rec = rec_size // 8
     base = atom.off + 16
-    out: list[dict[str, int]] = []
-    for i in range(rec_count):
-        off = base + i * rec_size
-        if off + rec_size > len(buf):
-            break
-        rec: dict[str, int] = {}
-        for p in range(pairs_per_rec):
-            tag = u32le(buf, off + p * 8 + 0)
-            val = u32le(buf, off + p * 8 + 4)
-            rec[fourcc(tag)] = val
-        out.append(rec)
-    return out
+    # Records past the end of the buffer are dropped.
+    n = max(0, min(rec_count, (len(buf) - base) // rec_size))
+    return decode_atom_records(buf[base : base + n * rec_size], rec_size)
 
 
 def parse_geom_hdr(buf: bytes, geom_off: int) -> list[int]:
@@ -156,7 +177,7 @@ def parse_geom_hdr(buf: bytes, geom_off: int) -> list[int]:
     base = geom_off + 16
     if base + 0x20 > len(buf):
         return []
-    return [u32le(buf, base + i * 4) for i in range(8)]
+    return list(GEOM_HDR.unpack_from(buf, base))
 
 
 def main() -> int:
@@ -164,27 +185,24 @@ def main() -> int:
     ap.add_argument("path", type=Path)
     args = ap.parse_args()
 
-    buf = args.path.read_bytes()
+    buf = map_file(args.path)
     version, unk24, unk28 = parse_header(buf)
     print(f"[axo] version={version} unk24=0x{unk24:08X} unk28=0x{unk28:08X}")
 
     chunks = walk_top(buf)
-    tex_chunk: Chunk | None = None
-    mtrl_chunk: Chunk | None = None
+    # TEX/MTRL tables are decoded once while listing and reused to resolve ATOM bindings.
+    tex: list[tuple[int, str]] = []
+    mtrl: list[tuple[int, int, int]] = []
     atom_chunk: Chunk | None = None
     for i, c in enumerate(chunks):
         print(
             f"[axo] chunk[{i}] off=0x{c.off:X} tag='{c.tag4}' size=0x{c.size:X} count={c.count} unkC=0x{c.unk_c:X}"
         )
-        if c.tag == TAG_TEX_:
-            tex_chunk = c
-        if c.tag == TAG_MTRL:
-            mtrl_chunk = c
         if c.tag == TAG_ATOM:
             atom_chunk = c
         if c.tag == TAG_MTRL:
-            mats = parse_mtrl(buf, c.off)
-            for mi, (key, tex_id, unk4) in enumerate(mats):
+            mtrl = parse_mtrl(buf, c.off)
+            for mi, (key, tex_id, unk4) in enumerate(mtrl):
                 print(f"[axo]   mtrl[{mi}] key={key} texId={tex_id} unk4={unk4}")
         if c.tag == TAG_TEX_:
             tex = parse_tex(buf, c.off)
@@ -210,15 +228,7 @@ def main() -> int:
                         )
 
     if atom_chunk is not None:
-        tex_by_id: dict[int, str] = {}
-        if tex_chunk is not None:
-            for tid, name in parse_tex(buf, tex_chunk.off):
-                tex_by_id[tid] = name
-
-        mtrl = []
-        if mtrl_chunk is not None:
-            mtrl = parse_mtrl(buf, mtrl_chunk.off)
-
+        tex_by_id = dict(tex)
         atoms = parse_atom(buf, atom_chunk)
         for ai, rec in enumerate(atoms):
             geom_i = rec.get("GEOM")
@@ -5,17 +5,60 @@
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import struct
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+# Precompiled readers for the header/record layouts parsed below.
+U32 = struct.Struct("<I")
+FILE_HDR = struct.Struct("<8I")  # INFO chunk header, AXO_, version, unk24, unk28
+CHUNK_HDR = struct.Struct("<4I")  # tag, size, count, unk_c
+
+
 def u32le(b: bytes, off: int) -> int:
-    return struct.unpack_from("<I", b, off)[0]
+    return U32.unpack_from(b, off)[0]
 
 
+# Only a handful of distinct tags ever occur, so the decoded names are memoized.
+@lru_cache(maxsize=1024)
 def fourcc(u: int) -> str:
-    return struct.pack("<I", u).decode("ascii", "replace")
+    return U32.pack(u).decode("ascii", "replace")
+
+
+def map_file(path: Path) -> bytes | mmap.mmap:
+    # Read-only memory map of the file; empty files can't be mapped and come back as b"".
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# The header and the TEX/MTRL/ATOM tables sit in the first chunks of a file; GEOM/VIF
+# payloads further in are never read by the validator.
+PREFETCH_BYTES = 0x10000
+
+
+def prefetch_files(paths: list[Path]) -> None:
+    # Ask the kernel to start reading the head of every file now, so the reads overlap
+    # instead of each file's pages being faulted in one at a time as it's validated.
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
 
 TAG_INFO = 0x4F464E49  # "INFO"
@@ -42,11 +85,14 @@ class Chunk:
 
 
 def parse_header(b: bytes) -> bool:
-    return len(b) >= 0x20 and u32le(b, 0x00) == TAG_INFO and u32le(b, 0x10) == TAG_AXO_
+    if len(b) < 0x20:
+        return False
+    hdr = FILE_HDR.unpack_from(b, 0)
+    return hdr[0] == TAG_INFO and hdr[4] == TAG_AXO_
 
 
 def parse_chunk_at(b: bytes, off: int) -> Chunk:
-    return Chunk(off, u32le(b, off), u32le(b, off + 4), u32le(b, off + 8), u32le(b, off + 12))
+    return Chunk(off, *CHUNK_HDR.unpack_from(b, off))
 
 
 def walk_top(b: bytes) -> list[Chunk]:
@@ -61,122 +107,173 @@ def walk_top(b: bytes) -> list[Chunk]:
     return out
 
 
+# TEX record (36 bytes): u32 id, char[32] NUL-padded name
+TEX_REC = struct.Struct("<I32s")
+
+
+def walk_top_until(b: bytes, wanted: set[int]) -> dict[int, Chunk]:
+    # Like walk_top, but keeps only the first chunk of each wanted tag and stops as soon as
+    # all of them are found (or at END).
+    found: dict[int, Chunk] = {}
+    off = 0
+    while off + 16 <= len(b):
+        c = parse_chunk_at(b, off)
+        if c.tag in wanted and c.tag not in found:
+            found[c.tag] = c
+            if len(found) == len(wanted):
+                break
+        if c.tag == TAG_END_:
+            break
+        off = off + 16 + c.size
+    return found
+
+
 def parse_tex(b: bytes, tex: Chunk) -> dict[int, str]:
     if tex.tag != TAG_TEX_:
         return {}
-    out: dict[int, str] = {}
     off = tex.off + 16
-    for _ in range(tex.count):
-        if off + 36 > len(b):
-            break
-        tid = u32le(b, off)
-        name_raw = b[off + 4 : off + 36]
-        name = name_raw.split(b"\x00", 1)[0].decode("ascii", "replace")
-        out[tid] = name
-        off += 36
-    return out
+    # Records past the end of the buffer are dropped; the table is read through a view.
+    n = max(0, min(tex.count, (len(b) - off) // TEX_REC.size))
+    with memoryview(b) as mv:
+        return {
+            tid: name_raw.split(b"\x00", 1)[0].decode("ascii", "replace")
+            for tid, name_raw in TEX_REC.iter_unpack(mv[off : off + n * TEX_REC.size])
+        }
+
+
+# MTRL record (68 bytes): u32 key, i32 unk4, ..., u32 tex_id at +0x3C, ...
+MTRL_REC = struct.Struct("<Ii52xI4x")
+
+
+def iter_mtrl(b: bytes, mtrl: Chunk):
+    # (key, unk4, tex_id) per MTRL record; records past the end of the buffer are dropped.
+    off = mtrl.off + 16
+    n = max(0, min(mtrl.count, (len(b) - off) // MTRL_REC.size))
+    return MTRL_REC.iter_unpack(b[off : off + n * MTRL_REC.size])
 
 
 def parse_mtrl_keys(b: bytes, mtrl: Chunk) -> set[int]:
     if mtrl.tag != TAG_MTRL:
         return set()
-    out: set[int] = set()
-    off = mtrl.off + 16
-    for _ in range(mtrl.count):
-        if off + 68 > len(b):
-            break
-        out.add(u32le(b, off + 0))
-        off += 68
-    return out
+    return {key for key, _unk4, _tex_id in iter_mtrl(b, mtrl)}
 
 
 def parse_mtrl_key_to_texid(b: bytes, mtrl: Chunk) -> dict[int, int]:
     if mtrl.tag != TAG_MTRL:
         return {}
-    out: dict[int, int] = {}
-    off = mtrl.off + 16
-    for _ in range(mtrl.count):
-        if off + 68 > len(b):
-            break
-        key = u32le(b, off + 0)
-        tex_id = u32le(b, off + 15 * 4)
-        out[key] = tex_id
-        off += 68
+    return {key: tex_id for key, _unk4, tex_id in iter_mtrl(b, mtrl)}
+
+
+def decode_atom_geom_mtrl(table: bytes, rec_size: int) -> list[tuple[int | None, int | None]]:
+    # ATOM records are rec_size // 8 (fourcc tag, u32 value) pairs; all records are
+    # unpacked in one iter_unpack pass over the table. Only the GEOM and MTRL values are
+    # needed, so they are picked by column instead of building a dict per record.
+    if not table:
+        return []
+    rec = struct.Struct(f"<{rec_size // 4}I")
+    out: list[tuple[int | None, int | None]] = []
+    tags: tuple[int, ...] = ()
+    geom_col = mtrl_col = None
+    for fields in rec.iter_unpack(table):
+        # Records of one ATOM normally share a tag sequence; only re-derive columns on change.
+        if fields[0::2] != tags:
+            tags = fields[0::2]
+            # The last pair wins when a tag repeats, as with dict(zip(names, values)).
+            cols = {fourcc(t): 2 * k + 1 for k, t in enumerate(tags)}
+            geom_col = cols.get("GEOM")
+            mtrl_col = cols.get("MTRL")
+        out.append(
+            (
+                None if geom_col is None else fields[geom_col],
+                None if mtrl_col is None else fields[mtrl_col],
+            )
+        )
     return out
 
 
-def parse_atom_pairs(b: bytes, atom: Chunk) -> list[dict[str, int]]:
+def parse_atom_geom_mtrl(b: bytes, atom: Chunk) -> list[tuple[int | None, int | None]]:
     if atom.tag != TAG_ATOM:
         return []
     rec_size = atom.unk_c
     if rec_size <= 0 or (rec_size % 8) != 0:
         return []
-    pairs = rec_size // 8
     base = atom.off + 16
-    out: list[dict[str, int]] = []
-    for i in range(atom.count):
-        off = base + i * rec_size
-        if off + rec_size > len(b):
-            break
-        rec: dict[str, int] = {}
-        for p in range(pairs):
-            tag = u32le(b, off + p * 8 + 0)
-            val = u32le(b, off + p * 8 + 4)
-            rec[fourcc(tag)] = val
-        out.append(rec)
-    return out
+    # Records past the end of the buffer are dropped.
+    n = max(0, min(atom.count, (len(b) - base) // rec_size))
+    return decode_atom_geom_mtrl(b[base : base + n * rec_size], rec_size)
+
+
+def validate_one(p: Path) -> tuple[int, list[str]]:
+    # Validates one file; returns its bad count and the report lines to print, in order.
+    bad = 0
+    msgs: list[str] = []
+    b = map_file(p)
+    if not parse_header(b):
+        return bad, msgs
+    chunks = walk_top_until(b, {TAG_TEX_, TAG_MTRL, TAG_ATOM})
+
+    tex_chunk = chunks.get(TAG_TEX_)
+    mtrl_chunk = chunks.get(TAG_MTRL)
+    atom_chunk = chunks.get(TAG_ATOM)
+
+    tex = parse_tex(b, tex_chunk) if tex_chunk else {}
+    mtrl_keys = parse_mtrl_keys(b, mtrl_chunk) if mtrl_chunk else set()
+    mtrl_key_to_texid = parse_mtrl_key_to_texid(b, mtrl_chunk) if mtrl_chunk else {}
+    atoms = parse_atom_geom_mtrl(b, atom_chunk) if atom_chunk else []
+
+    # Validate ATOM->MTRL key and ATOM->TEX name existence.
+    for ai, (geom, mtrl) in enumerate(atoms):
+        if geom is None or mtrl is None:
+            continue
+        name = ""
+        if mtrl_keys and mtrl not in mtrl_keys:
+            bad += 1
+            msgs.append(f"[bad] {p} atom[{ai}] GEOM={geom} MTRL(key)={mtrl} not found in MTRL table")
+        if tex and mtrl_key_to_texid:
+            tid = mtrl_key_to_texid.get(mtrl)
+            if tid is not None and tid not in tex:
+                bad += 1
+                msgs.append(f"[bad] {p} atom[{ai}] GEOM={geom} TEX(id)={tid} not found in TEX table")
+            if tid is None:
+                continue
+            name = tex.get(tid, "")
+
+        if name:
+            tex_path = p.parent / (name + ".agi.png")
+            if not tex_path.exists():
+                bad += 1
+                msgs.append(f"[bad] {p} atom[{ai}] texture file missing: {tex_path}")
+    return bad, msgs
 
 
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("root", type=Path, nargs="?", default=Path("in"))
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes for validating files (default: CPU count; 1 = no pool)",
+    )
     args = ap.parse_args()
 
     bad = 0
-    total = 0
-    for p in args.root.rglob("*.axo"):
-        total += 1
-        b = p.read_bytes()
-        if not parse_header(b):
-            continue
-        chunks = walk_top(b)
-
-        tex_chunk = next((c for c in chunks if c.tag == TAG_TEX_), None)
-        mtrl_chunk = next((c for c in chunks if c.tag == TAG_MTRL), None)
-        atom_chunk = next((c for c in chunks if c.tag == TAG_ATOM), None)
-
-        tex = parse_tex(b, tex_chunk) if tex_chunk else {}
-        mtrl_keys = parse_mtrl_keys(b, mtrl_chunk) if mtrl_chunk else set()
-        mtrl_key_to_texid = parse_mtrl_key_to_texid(b, mtrl_chunk) if mtrl_chunk else {}
-        atoms = parse_atom_pairs(b, atom_chunk) if atom_chunk else []
-
-        # Validate ATOM->MTRL key and ATOM->TEX name existence.
-        for ai, rec in enumerate(atoms):
-            geom = rec.get("GEOM")
-            mtrl = rec.get("MTRL")
-            if geom is None or mtrl is None:
-                continue
-            if mtrl_keys and mtrl not in mtrl_keys:
-                bad += 1
-                print(f"[bad] {p} atom[{ai}] GEOM={geom} MTRL(key)={mtrl} not found in MTRL table")
-            if tex and mtrl_key_to_texid:
-                tid = mtrl_key_to_texid.get(mtrl)
-                if tid is not None and tid not in tex:
-                    bad += 1
-                    print(f"[bad] {p} atom[{ai}] GEOM={geom} TEX(id)={tid} not found in TEX table")
-                if tid is None:
-                    continue
-                name = tex.get(tid, "")
-            elif tex:
-                name = ""
-
-            if name:
-                tex_path = p.parent / (name + ".agi.png")
-                if not tex_path.exists():
-                    bad += 1
-                    print(f"[bad] {p} atom[{ai}] texture file missing: {tex_path}")
-
-    print(f"[axo_validate] checked={total} bad={bad}")
+    paths = list(args.root.rglob("*.axo"))
+    prefetch_files(paths)
+    # Files are independent, so validate them on a process pool; ex.map keeps the report
+    # in file order. --jobs 1 stays in-process.
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            results = list(ex.map(validate_one, paths, chunksize=32))
+    else:
+        results = map(validate_one, paths)
+    for bad_i, msgs in results:
+        bad += bad_i
+        for m in msgs:
+            print(m)
+
+    print(f"[axo_validate] checked={len(paths)} bad={bad}")
     return 0
 
 
@@ -5,17 +5,40 @@
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import struct
+import sys
+from array import array
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+# Precompiled readers for the header/record layouts parsed below.
+U32 = struct.Struct("<I")
+CHUNK_HDR = struct.Struct("<4I")  # tag, size, count, unk_c
+GEOM_HDR = struct.Struct("<8I")
+TAIL_QWORDS = struct.Struct("<6Q")
+
+
 def u32le(b: bytes, off: int) -> int:
-    return struct.unpack_from("<I", b, off)[0]
+    return U32.unpack_from(b, off)[0]
 
 
+# Only a handful of distinct tags ever occur, so the decoded names are memoized.
+@lru_cache(maxsize=1024)
 def fourcc(u: int) -> str:
-    return struct.pack("<I", u).decode("ascii", "replace")
+    return U32.pack(u).decode("ascii", "replace")
+
+
+def map_file(path: Path) -> bytes | mmap.mmap:
+    # Read-only memory map of the file; empty files can't be mapped and come back as b"".
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 TAG_GEOG = 0x474F4547  # "GEOG"
@@ -36,10 +59,7 @@ class Chunk:
 
 
 def parse_chunk_at(buf: bytes, off: int) -> Chunk:
-    tag = u32le(buf, off + 0)
-    size = u32le(buf, off + 4)
-    count = u32le(buf, off + 8)
-    unk_c = u32le(buf, off + 12)
+    tag, size, count, unk_c = CHUNK_HDR.unpack_from(buf, off)
     return Chunk(off, tag, size, count, unk_c)
 
 
@@ -70,56 +90,37 @@ def parse_geog_children(buf: bytes, geog_off: int) -> list[Chunk]:
     return out
 
 
+# VIFcode names by base command (cmd & 0x7F); the UNPACK family (0x60..0x7F) shares one name.
+VIF_CMD_NAMES = {
+    0x00: "NOP",
+    0x01: "STCYCL",
+    0x02: "OFFSET",
+    0x03: "BASE",
+    0x04: "ITOP",
+    0x05: "STMOD",
+    0x06: "MSKPATH3",
+    0x07: "MARK",
+    0x10: "FLUSHE",
+    0x11: "FLUSH",
+    0x13: "FLUSHA",
+    0x14: "MSCAL",
+    0x15: "MSCALF",
+    0x17: "MSCNT",
+    0x20: "STMASK",
+    0x30: "STROW",
+    0x31: "STCOL",
+    0x50: "DIRECT",
+    0x51: "DIRECTHL",
+}
+# Name for every cmd byte, so cmd_name() is a single index.
+CMD_NAME_TABLE = tuple(
+    "UNPACK" if (cmd & 0x60) == 0x60 else VIF_CMD_NAMES.get(cmd & 0x7F, f"CMD_{cmd & 0x7F:02X}")
+    for cmd in range(256)
+)
+
+
 def cmd_name(cmd: int) -> str:
-    base = cmd & 0x7F
-    if base == 0x00:
-        return "NOP"
-    if base == 0x01:
-        return "STCYCL"
-    if base == 0x02:
-        return "OFFSET"
-    if base == 0x03:
-        return "BASE"
-    if base == 0x04:
-        return "ITOP"
-    if base == 0x05:
-        return "STMOD"
-    if base == 0x06:
-        return "MSKPATH3"
-    if base == 0x07:
-        return "MARK"
-    if base == 0x14:
-        return "MSCAL"
-    if base == 0x10:
-        return "FLUSHE"
-    if base == 0x11:
-        return "FLUSH"
-    if base == 0x13:
-        return "FLUSHA"
-    if base == 0x15:
-        return "MSCALF"
-    if base == 0x17:
-        return "MSCNT"
-    if base == 0x20:
-        return "STMASK"
-    if base == 0x30:
-        return "STROW"
-    if base == 0x31:
-        return "STCOL"
-    if base == 0x50:
-        return "DIRECT"
-    if base == 0x51:
-        return "DIRECTHL"
-    if base == 0x20:
-        return "STMASK"
-    if base == 0x30:
-        return "STROW"
-    if base == 0x31:
-        return "STCOL"
-    if (cmd & 0x60) == 0x60:
-        # UNPACK family
-        return "UNPACK"
-    return f"CMD_{base:02X}"
+    return CMD_NAME_TABLE[cmd & 0xFF]
 
 def unpack_kind(cmd: int) -> str:
     # VIF UNPACK: cmd 0x60..0x7F; lower nibble encodes vn/vl.
@@ -154,6 +155,11 @@ def unpack_payload_words(cmd: int, num: int) -> int:
     words_per_vec = (comps * bits + 31) // 32
     return n * words_per_vec
 
+
+# Words per UNPACK vector for each cmd byte; 0 for codes outside the UNPACK family.
+UNPACK_WORDS_PER_VEC = bytes(unpack_payload_words(c, 1) if (c & 0x60) == 0x60 else 0 for c in range(256))
+
+
 def unpack_preview_as_f32(cmd: int, payload: bytes, count: int) -> list[list[float]] | None:
     vnvl = cmd & 0x0F
     vn = (vnvl >> 2) & 3
@@ -161,16 +167,9 @@ def unpack_preview_as_f32(cmd: int, payload: bytes, count: int) -> list[list[flo
     if vl != 0:
         return None
     comps = vn + 1
-    words_per_vec = comps
-    out: list[list[float]] = []
-    for i in range(count):
-        start = i * 4 * words_per_vec
-        end = start + 4 * words_per_vec
-        if end > len(payload):
-            break
-        vec = list(struct.unpack_from("<" + "f" * words_per_vec, payload, start))
-        out.append(vec)
-    return out
+    rec = struct.Struct(f"<{comps}f")
+    rows = max(0, min(count, len(payload) // rec.size))
+    return [list(vec) for vec in rec.iter_unpack(payload[: rows * rec.size])]
 
 def unpack_preview_bits(cmd: int, payload: bytes, count_vec: int) -> list[str]:
     vnvl = cmd & 0x0F
@@ -183,53 +182,67 @@ def unpack_preview_bits(cmd: int, payload: bytes, count_vec: int) -> list[str]:
         f32 = unpack_preview_as_f32(cmd, payload, n)
         if f32 is None:
             return []
-        return [" ".join([f"{v:.6g}" for v in vec]) for vec in f32]
+        # Per-component formatting goes through one %-template per row.
+        f32_fmt = " ".join(["%.6g"] * comps)
+        return [f32_fmt % tuple(vec) for vec in f32]
+    # Each vector is padded to whole words; its components are the leading little-endian
+    # halves/bytes of its record.
+    words_per_vec = (comps * bits + 31) // 32
+    stride = 4 * words_per_vec
+    rows = min(n, len(payload) // stride)
     if bits == 16:
-        words_per_vec = (comps * bits + 31) // 32
-        lines: list[str] = []
-        for i in range(n):
-            start = i * 4 * words_per_vec
-            end = start + 4 * words_per_vec
-            if end > len(payload):
-                break
-            words = struct.unpack_from("<" + "I" * words_per_vec, payload, start)
-            halves: list[str] = []
-            for w in words:
-                halves.append(f"{w & 0xFFFF:04X}")
-                halves.append(f"{(w >> 16) & 0xFFFF:04X}")
-            # Only keep the components we nominally have.
-            halves = halves[:comps]
-            lines.append(" ".join(halves))
-        return lines
+        # One padded record format decodes all previewed vectors at once.
+        rec = struct.Struct(f"<{comps}H{stride - comps * 2}x")
+        hex_fmt = " ".join(["%04X"] * comps)
+        return [hex_fmt % vec for vec in rec.iter_unpack(payload[: rows * stride])]
     if bits == 8:
-        words_per_vec = (comps * bits + 31) // 32
-        lines = []
-        for i in range(n):
-            start = i * 4 * words_per_vec
-            end = start + 4 * words_per_vec
-            if end > len(payload):
-                break
-            words = struct.unpack_from("<" + "I" * words_per_vec, payload, start)
-            bs: list[str] = []
-            for w in words:
-                bs.append(f"{w & 0xFF:02X}")
-                bs.append(f"{(w >> 8) & 0xFF:02X}")
-                bs.append(f"{(w >> 16) & 0xFF:02X}")
-                bs.append(f"{(w >> 24) & 0xFF:02X}")
-            bs = bs[:comps]
-            lines.append(" ".join(bs))
-        return lines
+        # Bytes print in memory order: hex the whole preview span once ("XX " per byte) and
+        # cut each vector's leading components out of it.
+        text = payload[: rows * stride].hex(" ").upper()
+        width = 3 * comps - 1
+        return [text[i : i + width] for i in range(0, 3 * rows * stride, 3 * stride)]
     # 5-bit (rare): show raw words.
-    words = [u32le(payload, i * 4) for i in range(min(len(payload) // 4, 8))]
-    return [" ".join([f"{w:08X}" for w in words])]
+    k = min(len(payload) // 4, 8)
+    return [" ".join(["%08X"] * k) % struct.unpack_from(f"<{k}I", payload)]
+
+
+def vif_words(buf: bytes, start: int, length: int) -> array:
+    # Every code and every skipped payload is a whole number of words, so the stream is
+    # decoded to u32 once and walked by word index instead of unpacking each code.
+    end = min(len(buf), start + length)
+    n_words = max(0, end - start) // 4
+    words = array("I")
+    words.frombytes(buf[start : start + n_words * 4])
+    if sys.byteorder != "little":
+        words.byteswap()
+    return words
+
+
+def walk_vif(words: array) -> Iterator[tuple[int, int]]:
+    # Yields (word index, code) per VIFcode, stepping over immediate data and UNPACK payloads.
+    n_words = len(words)
+    i = 0
+    while i < n_words:
+        code = words[i]
+        yield i, code
+        cmd = code >> 24
+        base = cmd & 0x7F
+        i += 1
+        if base in (0x20, 0x30, 0x31):  # STMASK/STROW/STCOL: 4 words
+            i += 4
+        elif base in (0x50, 0x51):  # DIRECT/DIRECTHL: imm is qword count
+            i += (code & 0xFFFF) * 4
+        elif UNPACK_WORDS_PER_VEC[cmd]:  # UNPACK: num vectors (0 means 256)
+            i += UNPACK_WORDS_PER_VEC[cmd] * (((code >> 16) & 0xFF) or 256)
 
 
 def dump_vif(buf: bytes, start: int, length: int, max_codes: int, preview: int) -> None:
-    off = start
+    view = memoryview(buf)
     end = min(len(buf), start + length)
-    n = 0
-    while off + 4 <= end and n < max_codes:
-        code = u32le(buf, off)
+    for n, (i, code) in enumerate(walk_vif(vif_words(buf, start, length))):
+        if n >= max_codes:
+            break
+        off = start + i * 4
         imm = code & 0xFFFF
         num = (code >> 16) & 0xFF
         cmd = (code >> 24) & 0xFF
@@ -240,73 +253,36 @@ def dump_vif(buf: bytes, start: int, length: int, max_codes: int, preview: int)
             extra = " " + unpack_kind(cmd) + " " + unpack_imm_info(imm)
         print(f"  +0x{off-start:04X} code=0x{code:08X} cmd=0x{cmd:02X} {name:7s} num={num:3d} imm=0x{imm:04X}{extra}")
 
-        off += 4
-        n += 1
-
-        base = cmd & 0x7F
-
-        # Skip embedded/immediate data for known commands.
-        if base in (0x20, 0x30, 0x31):  # STMASK/STROW/STCOL: 4 words
-            off += 16
-        elif base in (0x50, 0x51):  # DIRECT/DIRECTHL: imm is qword count
-            off += imm * 16
-        elif (cmd & 0x60) == 0x60:
-            # UNPACK: payload length is determined by VN/VL + num.
-            payload_words = unpack_payload_words(cmd, num)
-            payload_bytes = payload_words * 4
-            payload = buf[off : min(end, off + payload_bytes)]
-            if preview > 0:
-                for i, line in enumerate(unpack_preview_bits(cmd, payload, preview)):
-                    print(f"        data[{i}] {line}")
-            off += payload_bytes
+        if preview > 0 and (cmd & 0x60) == 0x60:
+            # Preview decoding reads the payload through a view, not a copy.
+            payload_bytes = unpack_payload_words(cmd, num) * 4
+            payload = view[off + 4 : min(end, off + 4 + payload_bytes)]
+            for j, line in enumerate(unpack_preview_bits(cmd, payload, preview)):
+                print(f"        data[{j}] {line}")
 
 def summarize_vif(buf: bytes, start: int, length: int) -> None:
-    off = start
-    end = min(len(buf), start + length)
-
     pkt = 0
-    counts: dict[tuple[int, int], int] = {}
-
-    def flush(kind: str, at_off: int) -> None:
-        nonlocal pkt
-        if not counts:
-            print(f"[vif] pkt[{pkt}] {kind} at +0x{at_off - start:04X} (no unpack)")
-            pkt += 1
-            return
-        parts = []
-        for (cmd, addr), n in sorted(counts.items(), key=lambda x: (x[0][0], x[0][1])):
-            parts.append(f"{cmd_name(cmd)}@{addr}: {n}")
-        print(f"[vif] pkt[{pkt}] {kind} at +0x{at_off - start:04X} " + ", ".join(parts))
-        pkt += 1
-
-    while off + 4 <= end:
-        code = u32le(buf, off)
-        imm = code & 0xFFFF
-        num = (code >> 16) & 0xFF
-        cmd = (code >> 24) & 0xFF
-        base = cmd & 0x7F
-        off += 4
-
-        if base in (0x20, 0x30, 0x31):
-            off += 16
-            continue
-        if base in (0x50, 0x51):
-            off += imm * 16
-            continue
-        if (cmd & 0x60) == 0x60:
-            n = 256 if num == 0 else num
-            addr = imm & 0x03FF
-            counts[(cmd, addr)] = counts.get((cmd, addr), 0) + n
-            off += unpack_payload_words(cmd, num) * 4
+    # UNPACK vector counts of the current packet. Keys keep only the code's cmd and addr
+    # bits (cmd << 24 | addr), so they sort like (cmd, addr) without building tuples.
+    counts: dict[int, int] = {}
+
+    for i, code in walk_vif(vif_words(buf, start, length)):
+        cmd = code >> 24
+        if UNPACK_WORDS_PER_VEC[cmd]:
+            key = code & 0xFF0003FF
+            counts[key] = counts.get(key, 0) + (((code >> 16) & 0xFF) or 256)
             continue
-        if base == 0x14:
-            flush("MSCAL", off - 4)
-            counts.clear()
+        base = cmd & 0x7F
+        if base != 0x14 and base != 0x17:  # only MSCAL/MSCNT end a packet
             continue
-        if base == 0x17:
-            flush("MSCNT", off - 4)
+        head = f"[vif] pkt[{pkt}] {VIF_CMD_NAMES[base]} at +0x{i * 4:04X}"
+        if counts:
+            parts = [f"{CMD_NAME_TABLE[key >> 24]}@{key & 0x03FF}: {n}" for key, n in sorted(counts.items())]
+            print(head + " " + ", ".join(parts))
             counts.clear()
-            continue
+        else:
+            print(head + " (no unpack)")
+        pkt += 1
 
 
 def main() -> int:
@@ -318,7 +294,7 @@ def main() -> int:
     ap.add_argument("--summary", action="store_true", help="print packet summary grouped by MSCAL/MSCNT")
     args = ap.parse_args()
 
-    buf = args.path.read_bytes()
+    buf = map_file(args.path)
     top = walk_top(buf)
     geog = next((c for c in top if c.tag == TAG_GEOG), None)
     if geog is None:
@@ -336,7 +312,7 @@ def main() -> int:
     if payload + 0x20 > len(buf):
         raise SystemExit("GEOM payload too small")
 
-    hdr = [u32le(buf, payload + i * 4) for i in range(8)]
+    hdr = list(GEOM_HDR.unpack_from(buf, payload))
     print(f"[geom] idx={args.geom} off=0x{g.off:X} size=0x{g.size:X} count={g.count} unkC=0x{g.unk_c:X}")
     print("[geom] hdr " + " ".join([f"u32[{i}]=0x{v:X}" for i, v in enumerate(hdr)]))
 
@@ -352,8 +328,7 @@ def main() -> int:
 
     # Last 0x30 bytes are treated as 6 qwords by the game's packet builder.
     if payload + g.size >= tail_off + 0x30:
-        tail = buf[tail_off : tail_off + 0x30]
-        q = struct.unpack_from("<" + "Q" * 6, tail, 0)
+        q = TAIL_QWORDS.unpack_from(buf, tail_off)
         for i, v in enumerate(q):
             print(f"[geom] tail.qword[{i}] = 0x{v:016X}")
 